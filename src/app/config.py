@@ -11,28 +11,28 @@ from functools import lru_cache
 # https://records.ureg.virginia.edu/preview_program.php?catoid=67&poid=10221
 # =============================================================================
 
-COURSE_CLUSTERS: dict[str, list[str]] = {
+COURSE_CLUSTERS: dict[str, tuple[str, ...]] = {
     # ===== BA/BS in Computer Science =====
 
     # Prerequisites to declare the major (7 credits total)
-    "cs_prerequisites": [
+    "cs_prerequisites": (
         "CS 1110", "CS 1111", "CS 1112", "CS 1113",  # choose ONE (Intro to Programming)
         "CS 2100",  # Data Structures and Algorithms 1
-    ],
+    ),
 
     # Required CS courses in the major (20 credits total) - HIGH PRIORITY
-    "CS_REQUIRED_COURSES": [
+    "CS_REQUIRED_COURSES": (
         "CS 2120",  # Discrete Mathematics and Theory 1
         "CS 2130",  # Computer Systems and Organization 1
         "CS 3100",  # Data Structures and Algorithms 2
         "CS 3120",  # Discrete Mathematics and Theory 2
         "CS 3130",  # Computer Systems and Organization 2
         "CS 3140",  # Software Development Essentials
-    ],
+    ),
 
     # Restricted electives (pick THREE courses = 9 credits)
     # Note: at most 3 credits of CS 4993 may count toward this requirement.
-    "cs_restricted_electives": [
+    "cs_restricted_electives": (
         "CS 3205",  # HCI in Software Development
         "CS 3240",  # Software Engineering
         "CS 3250",  # Software Testing
@@ -61,12 +61,12 @@ COURSE_CLUSTERS: dict[str, list[str]] = {
         "CS 4790",  # Cryptocurrency
         "CS 4810",  # Introduction to Computer Graphics
         "CS 4993",  # Independent Study (1-3)
-    ],
+    ),
 
     # Distinguished Majors Program thesis course (6 credits total across two semesters)
-    "cs_distinguished_majors": [
+    "cs_distinguished_majors": (
         "CS 4998",
-    ],
+    ),
 }
 
 CLUSTER_DESCRIPTIONS: dict[str, str] = {
@@ -86,6 +86,15 @@ CLUSTER_WEIGHTS: dict[str, int] = {
     "cs_distinguished_majors": 1,
 }
 
+# Course code -> clusters containing it (in COURSE_CLUSTERS order), built once
+_COURSE_TO_CLUSTERS: dict[str, list[str]] = {}
+for _cluster_name, _courses in COURSE_CLUSTERS.items():
+    # dict.fromkeys: a course listed twice in a cluster is indexed once
+    for _course in dict.fromkeys(_courses):
+        _COURSE_TO_CLUSTERS.setdefault(_course, []).append(_cluster_name)
+del _cluster_name, _courses, _course
+
+
 def get_course_clusters(course_code: str) -> list[str]:
     """Get all clusters that a course belongs to.
 
@@ -95,11 +104,7 @@ def get_course_clusters(course_code: str) -> list[str]:
     Returns:
         List of cluster names this course belongs to
     """
-    clusters = []
-    for cluster_name, courses in COURSE_CLUSTERS.items():
-        if course_code in courses:
-            clusters.append(cluster_name)
-    return clusters
+    return list(_COURSE_TO_CLUSTERS.get(course_code, ()))
 
 
 def get_cluster_description(cluster_name: str) -> str:
@@ -114,9 +119,12 @@ def get_cluster_description(cluster_name: str) -> str:
     return CLUSTER_DESCRIPTIONS.get(cluster_name, cluster_name)
 
 
+@lru_cache(maxsize=None)
 def get_cluster_summary() -> str:
     """Get a formatted summary of all clusters for the AI system prompt.
     
+    Built from module constants, so it is computed once.
+    
     Returns:
         Formatted string describing all clusters and their courses
     """
@@ -156,6 +164,10 @@ class Settings(BaseSettings):
     embed_weight_instructor: int = 0
     embed_weight_schedule: int = 0
     
+    # RAG context budget, in characters (~4 characters per token)
+    rag_max_doc_chars: int = 6000
+    rag_max_context_chars: int = 48000
+    
     # SIS API
     sis_api_base_url: str = "https://sisuva.admin.virginia.edu/psc/ihprd/UVSS/SA/s/WEBLIB_HCX_CM.H_CLASS_SEARCH.FieldFormula.IScript_ClassSearch"
     
@@ -4,6 +4,8 @@ Combines data from multiple sources (SIS, Hooslist, TCF, RMP) into
 unified text documents for vector embedding and retrieval.
 """
 
+from functools import lru_cache
+from itertools import repeat
 from typing import Optional
 from app.config import get_settings, get_course_clusters, get_cluster_description, CLUSTER_WEIGHTS
 from app.data.sources.sis_api import SISApi
@@ -11,12 +13,32 @@ from app.data.stores.rmp_reviews_loader import get_rmp_loader
 from app.data.stores.tcf_reviews_loader import get_tcf_loader
 
 
+@lru_cache(maxsize=1024)
+def _course_clusters(course_code: str) -> tuple[str, ...]:
+    """Clusters for a course code (cluster config is static, so memoized)."""
+    return tuple(get_course_clusters(course_code))
+
+
+@lru_cache(maxsize=256)
+def _cluster_block(cluster: str, weight: int) -> str:
+    """Cluster line repeated `weight` times, built once per (cluster, weight)."""
+    return "\n".join(repeat(f"Cluster: {cluster} - {get_cluster_description(cluster)}", weight))
+
+
 class DocumentBuilder:
     """Builds text documents for RAG from course data."""
     
     def __init__(self):
         self.settings = get_settings()
         self.sis_api = SISApi()
+        # Embedding weights are fixed for the process; read them once
+        self._weights = (
+            self.settings.embed_weight_description,
+            self.settings.embed_weight_title,
+            self.settings.embed_weight_prerequisites,
+            self.settings.embed_weight_subject,
+            self.settings.embed_weight_cluster,
+        )
     
     def build_document(
         self,
@@ -40,59 +62,56 @@ class DocumentBuilder:
             Formatted text document for embedding
         """
         # Get embedding weights from config
-        desc_w = self.settings.embed_weight_description
-        title_w = self.settings.embed_weight_title
-        prereq_w = self.settings.embed_weight_prerequisites
-        subject_w = self.settings.embed_weight_subject
-        cluster_w = self.settings.embed_weight_cluster
+        desc_w, title_w, prereq_w, subject_w, cluster_w = self._weights
         
         parts = []
         
+        def add_weighted(line: str, weight: int) -> None:
+            # One pre-joined block per field instead of `weight` list entries
+            if weight > 0:
+                parts.append("\n".join(repeat(line, weight)))
+        
         # Subject (weight controlled)
         subject = course.get('subject', '')
         catalog_nbr = course.get('catalog_nbr', '')
-        subject_line = f"Subject: {subject} {catalog_nbr}"
-        parts.extend([subject_line] * subject_w)
+        if subject_w > 0:
+            add_weighted(f"Subject: {subject} {catalog_nbr}", subject_w)
         
         # Title (weight controlled)
         title = course.get('descr', '')
-        if title:
-            title_line = f"Title: {title}"
-            parts.extend([title_line] * title_w)
+        if title and title_w > 0:
+            add_weighted(f"Title: {title}", title_w)
         
         # Description (weight controlled - most important)
-        description = self._get_description(course, hooslist_info)
-        if description:
-            desc_line = f"Description: {description}"
-            parts.extend([desc_line] * desc_w)
+        if desc_w > 0:
+            description = self._get_description(course, hooslist_info)
+            if description:
+                add_weighted(f"Description: {description}", desc_w)
         
         # Prerequisites (weight controlled)
         prerequisites = ""
         if hooslist_info and hooslist_info.get("prerequisites"):
             prerequisites = hooslist_info['prerequisites']
-        if prerequisites:
-            prereq_line = f"Prerequisites: {prerequisites}"
-            parts.extend([prereq_line] * prereq_w)
+        if prerequisites and prereq_w > 0:
+            add_weighted(f"Prerequisites: {prerequisites}", prereq_w)
         
         # Course Clusters (weight controlled + per-cluster weights)
         course_code = f"{subject} {catalog_nbr}"
-        clusters = get_course_clusters(course_code)
-        if clusters:
+        clusters = _course_clusters(course_code)
+        if clusters and cluster_w > 0:
             for cluster in clusters:
-                desc = get_cluster_description(cluster)
                 # Apply both base cluster weight AND per-cluster weight multiplier
-                cluster_multiplier = CLUSTER_WEIGHTS.get(cluster, 1)
-                total_weight = cluster_w * cluster_multiplier
-                for _ in range(total_weight):
-                    parts.append(f"Cluster: {cluster} - {desc}")
+                total_weight = cluster_w * CLUSTER_WEIGHTS.get(cluster, 1)
+                if total_weight > 0:
+                    parts.append(_cluster_block(cluster, total_weight))
         
         # Credits (not weighted)
-        if course.get("units"):
-            parts.append(f"Credits: {course.get('units', '')}")
+        if units := course.get("units"):
+            parts.append(f"Credits: {units}")
         
         # Enrollment (not weighted)
-        if course.get("enrollment_total") is not None:
-            parts.append(f"Enrollment: {course.get('enrollment_total', 0)}/{course.get('class_capacity', 0)}")
+        if (enrollment := course.get("enrollment_total")) is not None:
+            parts.append(f"Enrollment: {enrollment}/{course.get('class_capacity', 0)}")
         
         # Instructor (not weighted)
         instructors = course.get("instructors", [])
@@ -104,18 +123,22 @@ class DocumentBuilder:
         meetings = course.get("meetings", [])
         if meetings:
             schedule_parts = []
+            # Bind loop-invariant lookups once instead of per meeting
+            format_time = self.sis_api.format_time
+            add_part = schedule_parts.append
             for meeting in meetings:
                 days = meeting.get("days", "")
                 start_time = meeting.get("start_time", "")
-                end_time = meeting.get("end_time", "")
+                if not (days and start_time):
+                    continue
                 
-                if days and start_time:
-                    start_fmt = self.sis_api.format_time(start_time)
-                    end_fmt = self.sis_api.format_time(end_time) if end_time else ""
-                    if end_fmt:
-                        schedule_parts.append(f"{days} {start_fmt}-{end_fmt}")
-                    else:
-                        schedule_parts.append(f"{days} {start_fmt}")
+                end_time = meeting.get("end_time", "")
+                start_fmt = format_time(start_time)
+                end_fmt = format_time(end_time) if end_time else ""
+                if end_fmt:
+                    add_part(f"{days} {start_fmt}-{end_fmt}")
+                else:
+                    add_part(f"{days} {start_fmt}")
             
             if schedule_parts:
                 parts.append(f"Schedule: {'; '.join(schedule_parts)}")
@@ -123,12 +146,15 @@ class DocumentBuilder:
         # Build base document
         base_doc = "\n".join(parts)
         
+        # Instructors with reviews to look up (shared by TCF and RMP)
+        review_names = self._review_instructor_names(instructors)
+        
         # Append TCF reviews matched by course + instructor
-        doc_with_tcf = self._append_tcf_reviews(base_doc, course)
+        doc_with_tcf = self._append_tcf_reviews(base_doc, course, review_names)
         
         # Append RMP reviews for this semester's instructors
         if include_rmp:
-            doc_with_tcf = self._append_rmp_reviews(doc_with_tcf, course)
+            doc_with_tcf = self._append_rmp_reviews(doc_with_tcf, course, review_names)
         
         return doc_with_tcf
     
@@ -142,37 +168,55 @@ class DocumentBuilder:
         Returns:
             Description string
         """
-        if hooslist_info and hooslist_info.get("description"):
-            return hooslist_info['description']
-        elif course.get("crse_descr"):
-            return course.get('crse_descr', '')
-        return ""
+        if hooslist_info and (description := hooslist_info.get("description")):
+            return description
+        return course.get("crse_descr") or ""
+    
+    @staticmethod
+    def _review_instructor_names(instructors: list[dict]) -> list[str]:
+        """Names of a section's instructors worth looking up reviews for.
+        
+        Args:
+            instructors: SIS 'instructors' list
+            
+        Returns:
+            Stripped names, skipping blanks and "Staff"
+        """
+        names = []
+        for inst in instructors:
+            inst_name = inst.get("name", "").strip()
+            if inst_name and inst_name.lower() != "staff":
+                names.append(inst_name)
+        return names
     
-    def _append_tcf_reviews(self, base_doc: str, course: dict) -> str:
+    def _append_tcf_reviews(
+        self,
+        base_doc: str,
+        course: dict,
+        names: Optional[list[str]] = None,
+    ) -> str:
         """Append TCF review data matched by course + instructor.
         
         Args:
             base_doc: Base document text
             course: Course dictionary from SIS (with 'instructors' list)
+            names: Precomputed _review_instructor_names, if available
             
         Returns:
             Document with TCF reviews appended
         """
+        if names is None:
+            names = self._review_instructor_names(course.get("instructors", []))
+        if not names:
+            return base_doc
+        
         tcf_loader = get_tcf_loader()
-        instructors = course.get("instructors", [])
         subject = course.get("subject", "")
         catalog_nbr = course.get("catalog_nbr", "")
         
-        if not instructors:
-            return base_doc
-        
         tcf_parts = []
         
-        for inst in instructors:
-            inst_name = inst.get("name", "").strip()
-            if not inst_name or inst_name.lower() == "staff":
-                continue
-            
+        for inst_name in names:
             # Get TCF reviews for this instructor + course combo
             tcf_data = tcf_loader.get_reviews_for_instructor(
                 subject, catalog_nbr, inst_name, limit=3
@@ -213,33 +257,35 @@ class DocumentBuilder:
         
         return base_doc + f"\n\nTheCourseForum Reviews:" + "".join(tcf_parts)
     
-    def _append_rmp_reviews(self, base_doc: str, course: dict) -> str:
+    def _append_rmp_reviews(
+        self,
+        base_doc: str,
+        course: dict,
+        names: Optional[list[str]] = None,
+    ) -> str:
         """Append RateMyProfessor reviews for this semester's instructors.
         
         Args:
             base_doc: Base document text
             course: Course dictionary from SIS (with 'instructors' list)
+            names: Precomputed _review_instructor_names, if available
             
         Returns:
             Document with RMP reviews appended
         """
-        rmp_loader = get_rmp_loader()
-        instructors = course.get("instructors", [])
-        
-        if not instructors:
+        if names is None:
+            names = self._review_instructor_names(course.get("instructors", []))
+        if not names:
             return base_doc
         
+        rmp_loader = get_rmp_loader()
         subject = course.get("subject", "")
         catalog_nbr = course.get("catalog_nbr", "")
         course_code = f"{subject} {catalog_nbr}"
         
         rmp_parts = []
         
-        for inst in instructors:
-            inst_name = inst.get("name", "").strip()
-            if not inst_name or inst_name.lower() == "staff":
-                continue
-            
+        for inst_name in names:
             # Get RMP reviews for this instructor + course
             reviews = rmp_loader.get_reviews_for_course_instructor(
                 course_code, inst_name, limit=5
@@ -294,20 +340,17 @@ class DocumentBuilder:
         subject = course.get("subject", "")
         catalog_number = course.get("catalog_nbr", "")
         course_code = f"{subject} {catalog_number}"
-        clusters = get_course_clusters(course_code)
+        clusters = _course_clusters(course_code)
         
         # Check if TCF has reviews for this course's instructors
         tcf_loader = get_tcf_loader()
-        instructors = course.get("instructors", [])
         has_tcf = False
         tcf_count = 0
-        for inst in instructors:
-            inst_name = inst.get("name", "").strip()
-            if inst_name and inst_name.lower() != "staff":
-                data = tcf_loader.get_reviews_for_instructor(subject, catalog_number, inst_name)
-                if data:
-                    has_tcf = True
-                    tcf_count += data.get("review_count", 0)
+        for inst_name in self._review_instructor_names(course.get("instructors", [])):
+            data = tcf_loader.get_reviews_for_instructor(subject, catalog_number, inst_name)
+            if data:
+                has_tcf = True
+                tcf_count += data.get("review_count", 0)
         
         return {
             "subject": subject,
@@ -62,11 +62,14 @@ class CourseIndexer:
         # Step 1: Fetch courses from SIS (with caching)
         courses = self._fetch_sis_courses(term, subjects, force_refresh)
         
+        # Unique (subject, catalog) courses, shared by steps 2 and 3
+        unique_courses = self._get_unique_courses(courses)
+        
         # Step 2: Fetch descriptions from Hooslist
-        hooslist_data = self._fetch_hooslist_descriptions(courses)
+        hooslist_data = self._fetch_hooslist_descriptions(courses, unique_courses)
         
         # Step 3: Fetch reviews from TheCourseForum
-        tcf_data = self._fetch_tcf_reviews(courses)
+        tcf_data = self._fetch_tcf_reviews(courses, unique_courses)
         
         # Step 4: Build documents and index
         return self._index_documents(courses, hooslist_data, tcf_data)
@@ -104,66 +107,58 @@ class CourseIndexer:
         print(f"Term: {term}")
         print()
         
-        all_courses = []
-        total_subjects = len(subjects)
+        subject_counts = dict.fromkeys(subjects, 0)
+        
+        def on_progress(subject: str, page: int, count: int, error: str = None) -> None:
+            if error:
+                print(f"[{subject}] Error on page {page}: {error}")
+            else:
+                subject_counts[subject] += count
+        
+        # Subjects are fetched concurrently; the term cache is saved by SISApi
         start_time = time.time()
+        all_courses = self.sis_api.fetch_all_courses(
+            subjects, term, on_progress=on_progress, use_cache=not force_refresh
+        )
         
+        total_subjects = len(subjects)
         for idx, subject in enumerate(subjects, 1):
-            subject_start = time.time()
-            subject_courses = 0
-            page = 1
-            
-            print(f"[{idx}/{total_subjects}] Fetching {subject}...", end=" ", flush=True)
-            
-            while True:
-                try:
-                    response = self.sis_api.search(subject=subject, term=term, page=page)
-                    classes = self.sis_api.get_classes_list(response)
-                    
-                    if not classes:
-                        break
-                    
-                    all_courses.extend(classes)
-                    subject_courses += len(classes)
-                    page += 1
-                    
-                    if page > 20:  # Safety limit
-                        break
-                        
-                except Exception as e:
-                    print(f"Error: {e}")
-                    break
-            
-            elapsed = time.time() - subject_start
-            print(f"{subject_courses} sections ({elapsed:.1f}s)")
+            print(f"[{idx}/{total_subjects}] {subject}: {subject_counts[subject]} sections")
         
         total_time = time.time() - start_time
         print(f"\nFetched {len(all_courses)} total sections in {total_time:.1f}s")
-        
-        # Cache the results (using SISStore)
-        self.sis_api.store.save(term, all_courses)
-        print(f"[CACHE] Saved to cache")
+        if all_courses:
+            print(f"[CACHE] Saved to cache")
         
         return all_courses
     
-    def _fetch_hooslist_descriptions(self, courses: list[dict]) -> dict:
+    def _fetch_hooslist_descriptions(
+        self,
+        courses: list[dict],
+        unique_courses: Optional[dict] = None,
+    ) -> dict:
         """Fetch descriptions from Hooslist for unique courses.
         
         Args:
             courses: List of course dictionaries
+            unique_courses: Precomputed _get_unique_courses(courses), if available
             
         Returns:
             Dictionary mapping "SUBJECT_CATALOG" to description info
         """
         # Get unique courses
-        unique_courses = self._get_unique_courses(courses)
+        if unique_courses is None:
+            unique_courses = self._get_unique_courses(courses)
         total = len(unique_courses)
         
-        # Count cached vs uncached
-        cached_count = sum(
-            1 for info in unique_courses.values()
-            if self.hooslist_api.store.has(info["subject"], info["catalog_nbr"])
-        )
+        # Count cached vs uncached (checked once per course, reused below)
+        cached_keys = {
+            key for key, info in unique_courses.items()
+            if self.hooslist_api.store.has(
+                info["subject"], info["catalog_nbr"], max_age=self.hooslist_api.CACHE_TTL
+            )
+        }
+        cached_count = len(cached_keys)
         to_fetch = total - cached_count
         
         print(f"\n{'='*50}")
@@ -186,7 +181,7 @@ class CourseIndexer:
             subject = info["subject"]
             catalog_nbr = info["catalog_nbr"]
             
-            was_cached = self.hooslist_api.store.has(subject, catalog_nbr)
+            was_cached = key in cached_keys
             descriptions[key] = self.hooslist_api.get_description(subject, catalog_nbr)
             
             if not was_cached:
@@ -208,16 +203,22 @@ class CourseIndexer:
         
         return descriptions
     
-    def _fetch_tcf_reviews(self, courses: list[dict]) -> dict:
+    def _fetch_tcf_reviews(
+        self,
+        courses: list[dict],
+        unique_courses: Optional[dict] = None,
+    ) -> dict:
         """Fetch reviews from TheCourseForum for unique courses.
         
         Args:
             courses: List of course dictionaries
+            unique_courses: Precomputed _get_unique_courses(courses), if available
             
         Returns:
             Dictionary mapping "SUBJECT_CATALOG" to reviews list
         """
-        unique_courses = self._get_unique_courses(courses)
+        if unique_courses is None:
+            unique_courses = self._get_unique_courses(courses)
         total = len(unique_courses)
         
         # Count cached vs uncached
@@ -310,14 +311,18 @@ class CourseIndexer:
         seen = set()
         
         for course in courses:
-            course_id = f"{course.get('subject', '')}_{course.get('catalog_nbr', '')}_{course.get('class_nbr', '')}"
+            subject = course.get("subject", "")
+            catalog_nbr = course.get("catalog_nbr", "")
+            class_nbr = course.get("class_nbr", "")
             
-            if course_id in seen:
+            section_key = (subject, catalog_nbr, class_nbr)
+            if section_key in seen:
                 continue
-            seen.add(course_id)
+            seen.add(section_key)
+            course_id = f"{subject}_{catalog_nbr}_{class_nbr}"
             
             # Get Hooslist data for this course
-            key = f"{course.get('subject', '')}_{course.get('catalog_nbr', '')}"
+            key = f"{subject}_{catalog_nbr}"
             hooslist_info = hooslist_data.get(key, {})
             
             # Build document (TCF + RMP reviews are loaded internally by document builder)
@@ -398,15 +403,14 @@ class CourseIndexer:
         Returns:
             Dictionary mapping "SUBJECT_CATALOG" to course info
         """
-        unique = {}
-        for course in courses:
-            key = f"{course.get('subject', '')}_{course.get('catalog_nbr', '')}"
-            if key not in unique:
-                unique[key] = {
-                    "subject": course.get("subject", ""),
-                    "catalog_nbr": course.get("catalog_nbr", ""),
-                }
-        return unique
+        # Dedupe on (subject, catalog) tuples; format keys once per unique course
+        pairs = dict.fromkeys(
+            (course.get("subject", ""), course.get("catalog_nbr", "")) for course in courses
+        )
+        return {
+            f"{subject}_{catalog_nbr}": {"subject": subject, "catalog_nbr": catalog_nbr}
+            for subject, catalog_nbr in pairs
+        }
     
     def get_status(self) -> dict:
         """Get current indexing status.
@@ -0,0 +1,37 @@
+"""Shared HTTP connection pool for the data source clients.
+
+SIS, Hooslist and TheCourseForum all run in the same indexing pass, so they
+share one pooled httpx.Client instead of each keeping its own connections.
+Per-service timeouts are passed on each request.
+"""
+
+import atexit
+from functools import lru_cache
+
+import httpx
+
+try:
+    import h2  # noqa: F401 - only needed for httpx's HTTP/2 support
+    HTTP2_AVAILABLE = True
+except ImportError:  # h2 is optional; fall back to HTTP/1.1 keep-alive
+    HTTP2_AVAILABLE = False
+
+# Pool limits shared by the sync client and per-loop async clients
+LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=32)
+
+
+@lru_cache
+def get_shared_client() -> httpx.Client:
+    """Get the process-wide pooled HTTP client (closed at interpreter exit).
+
+    Callers must not close it; with HTTP/2, concurrent requests to the same
+    host multiplex over one TLS connection.
+    """
+    client = httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        timeout=30.0,
+        follow_redirects=True,
+        limits=LIMITS,
+    )
+    atexit.register(client.close)
+    return client
@@ -4,19 +4,29 @@ Hooslist provides detailed course descriptions and prerequisite information
 that isn't available in the main SIS API.
 """
 
-import httpx
+import re
 from typing import Optional
 
+from app.data.sources._http import get_shared_client
 from app.data.stores import HooslistStore
 
 
+# Splits a description from its "Prerequisite(s):" section in one scan
+_PREREQ_RE = re.compile(r"Prerequisites?:")
+
+
 class HooslistApi:
     """Client for the Hooslist course description API with caching."""
     
     BASE_URL = "https://hooslist.virginia.edu/ClassSchedule/_GetCourseDescription"
     
+    # Descriptions change at most once a term; refetch cached ones after a week
+    CACHE_TTL = 7 * 24 * 3600
+    
     def __init__(self, timeout: float = 10.0, cache_dir: str = "data/cache"):
-        self.client = httpx.Client(timeout=timeout, follow_redirects=True)
+        # Process-wide pooled client shared with the other data sources
+        self.client = get_shared_client()
+        self.timeout = timeout
         self.store = HooslistStore(cache_dir)
     
     def get_description(
@@ -36,8 +46,8 @@ class HooslistApi:
             Dictionary with 'description' and 'prerequisites' keys
         """
         # Check cache first
-        if use_cache and self.store.has(subject, catalog_number):
-            cached = self.store.load(subject, catalog_number)
+        if use_cache:
+            cached = self.store.load(subject, catalog_number, max_age=self.CACHE_TTL)
             if cached:
                 return {
                     "description": cached.get("description", ""),
@@ -49,6 +59,7 @@ class HooslistApi:
             response = self.client.get(
                 self.BASE_URL,
                 params={"subject": subject.upper(), "courseNum": catalog_number},
+                timeout=self.timeout,
             )
             response.raise_for_status()
             
@@ -77,23 +88,11 @@ class HooslistApi:
         Returns:
             Dictionary with 'description' and 'prerequisites' keys
         """
-        description = ""
-        prerequisites = ""
-        
-        if "Prerequisites:" in text:
-            parts = text.split("Prerequisites:", 1)
-            description = parts[0].strip()
-            prerequisites = parts[1].strip()
-        elif "Prerequisite:" in text:
-            parts = text.split("Prerequisite:", 1)
-            description = parts[0].strip()
-            prerequisites = parts[1].strip()
-        else:
-            description = text
+        parts = _PREREQ_RE.split(text, maxsplit=1)
         
         return {
-            "description": description,
-            "prerequisites": prerequisites,
+            "description": parts[0].strip(),
+            "prerequisites": parts[1].strip() if len(parts) > 1 else "",
         }
     
     def fetch_batch(
@@ -120,7 +119,7 @@ class HooslistApi:
             key = f"{subject}_{catalog_number}"
             
             # Check if already cached
-            was_cached = use_cache and self.store.has(subject, catalog_number)
+            was_cached = use_cache and self.store.has(subject, catalog_number, max_age=self.CACHE_TTL)
             if was_cached:
                 cache_hits += 1
             
@@ -132,8 +131,7 @@ class HooslistApi:
         return descriptions
     
     def close(self):
-        """Close the HTTP client."""
-        self.client.close()
+        """Release the client (the shared pool stays open for other users)."""
     
     def __enter__(self):
         return self
@@ -6,18 +6,54 @@ Fetches professor reviews from RateMyProfessor with caching support.
 from __future__ import annotations
 
 import base64
+import contextlib
 import json
 import os
+import random
 import re
+import threading
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from email.utils import parsedate_to_datetime
 from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from cachetools import LRUCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to requests' stdlib json
+    orjson = None
 
 from app.data.stores import RMPStore
 
 
+# UVA course code with spaces removed, e.g. "CS1110"
+_COURSE_RE = re.compile(r"([A-Z]{2,4})(\d{4})")
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON bytes (orjson when available)."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _read_json(path: str) -> Any:
+    """Read and parse a JSON file."""
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
+
 # =============================================================================
 # Data Classes
 # =============================================================================
@@ -25,6 +61,15 @@ from app.data.stores import RMPStore
 class Professor:
     """Represents a professor from RateMyProfessor."""
     
+    __slots__ = (
+        "ratemyprof_id",
+        "name",
+        "first_name",
+        "last_name",
+        "num_of_ratings",
+        "overall_rating",
+    )
+    
     def __init__(
         self,
         ratemyprof_id: int,
@@ -77,16 +122,81 @@ class RateMyProfApi:
     """Low-level RateMyProfessor GraphQL API client."""
     
     GRAPHQL_URL = "https://www.ratemyprofessors.com/graphql"
+    
+    # Keep-alive pool size for the shared session (requests defaults to 10)
+    POOL_SIZE = 32
+
+    RATINGS_QUERY = """
+    query TeacherRatings($id: ID!, $after: String) {
+    node(id: $id) {
+        ... on Teacher {
+        ratings(first: 50, after: $after) {
+            edges {
+            cursor
+            node {
+                class
+                comment
+                date
+                difficultyRating
+                clarityRating
+                helpfulRating
+                wouldTakeAgain
+            }
+            }
+            pageInfo { hasNextPage endCursor }
+        }
+        }
+    }
+    }
+    """
+
+    # Fallback for schemas that don't expose clarity/helpful ratings
+    RATINGS_QUERY_MINIMAL = """
+    query TeacherRatings($id: ID!, $after: String) {
+    node(id: $id) {
+        ... on Teacher {
+        ratings(first: 50, after: $after) {
+            edges {
+            cursor
+            node {
+                class
+                comment
+                date
+                difficultyRating
+                wouldTakeAgain
+            }
+            }
+            pageInfo { hasNextPage endCursor }
+        }
+        }
+    }
+    }
+    """
 
     def __init__(self, school_id: str = "1277", testing: bool = False):
         self.UniversityId = str(school_id)
         self.testing = testing
 
-        folder = "SchoolID_" + self.UniversityId
-        if not os.path.exists(folder):
-            os.mkdir(folder)
-
         self.session = requests.Session()
+        # GraphQL reads are idempotent, so POSTs are safe to retry. Only
+        # connection-level failures are retried here; HTTP error statuses
+        # (429/5xx) surface as HTTPError from raise_for_status() so callers
+        # like RMPApi._get_reviews_with_retries back off in one place
+        # instead of stacking urllib3 retries under their own.
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(),
+            allowed_methods=None,
+            raise_on_status=False,
+            respect_retry_after_header=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_SIZE,
+            pool_maxsize=self.POOL_SIZE,
+            max_retries=retry,
+        )
+        self.session.mount("https://", adapter)
         self.session.headers.update({
             "User-Agent": (
                 "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -104,15 +214,26 @@ class RateMyProfApi:
         self.school_global_id = _global_id("School", self.UniversityId)
         self.professors: Dict[int, Professor] = self.scrape_professors(testing=self.testing)
 
+        # Last name (lowercase) -> professors, in scrape order
+        self._by_last_name: Dict[str, List[Professor]] = {}
+        for prof in self.professors.values():
+            self._by_last_name.setdefault(prof.last_name.lower().strip(), []).append(prof)
+
     def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a GraphQL query."""
-        resp = self.session.post(
-            self.GRAPHQL_URL,
-            json={"query": query, "variables": variables},
-            timeout=30,
-        )
+        body = {"query": query, "variables": variables}
+        if orjson is not None:
+            # Content-Type: application/json is already set on the session
+            resp = self.session.post(self.GRAPHQL_URL, data=orjson.dumps(body), timeout=30)
+        else:
+            resp = self.session.post(self.GRAPHQL_URL, json=body, timeout=30)
         resp.raise_for_status()
-        payload = resp.json()
+        payload = orjson.loads(resp.content) if orjson is not None else resp.json()
+        return self._graphql_data(payload)
+
+    @staticmethod
+    def _graphql_data(payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the data block from a GraphQL payload, raising on errors."""
         if "errors" in payload and payload["errors"]:
             raise RuntimeError(f"GraphQL errors: {payload['errors']}")
         return payload.get("data", {})
@@ -186,57 +307,11 @@ class RateMyProfApi:
 
     def create_reviews_list(self, tid: int, max_pages: int = 2) -> List[Dict[str, Any]]:
         """Fetch reviews for a professor via GraphQL."""
-        rich_query = """
-        query TeacherRatings($id: ID!, $after: String) {
-        node(id: $id) {
-            ... on Teacher {
-            ratings(first: 50, after: $after) {
-                edges {
-                cursor
-                node {
-                    class
-                    comment
-                    date
-                    difficultyRating
-                    clarityRating
-                    helpfulRating
-                    wouldTakeAgain
-                }
-                }
-                pageInfo { hasNextPage endCursor }
-            }
-            }
-        }
-        }
-        """
-
-        minimal_query = """
-        query TeacherRatings($id: ID!, $after: String) {
-        node(id: $id) {
-            ... on Teacher {
-            ratings(first: 50, after: $after) {
-                edges {
-                cursor
-                node {
-                    class
-                    comment
-                    date
-                    difficultyRating
-                    wouldTakeAgain
-                }
-                }
-                pageInfo { hasNextPage endCursor }
-            }
-            }
-        }
-        }
-        """
-
         teacher_id = _global_id("Teacher", tid)
         reviews: List[Dict[str, Any]] = []
         after: Optional[str] = None
         page_count = 0
-        query_to_use = rich_query
+        query_to_use = self.RATINGS_QUERY
         tried_fallback = False
 
         while True:
@@ -244,28 +319,12 @@ class RateMyProfApi:
                 data = self._graphql(query_to_use, {"id": teacher_id, "after": after})
             except RuntimeError as e:
                 if (not tried_fallback) and ("Cannot query field" in str(e)):
-                    query_to_use = minimal_query
+                    query_to_use = self.RATINGS_QUERY_MINIMAL
                     tried_fallback = True
                     continue
                 raise
 
-            node = data.get("node") or {}
-            ratings = node.get("ratings") or {}
-            edges = ratings.get("edges") or []
-
-            for edge in edges:
-                r = (edge or {}).get("node") or {}
-                reviews.append({
-                    "rClass": r.get("class") or "",
-                    "rComments": r.get("comment") or "",
-                    "rDate": r.get("date"),
-                    "rEasy": r.get("difficultyRating"),
-                    "rClarity": r.get("clarityRating"),
-                    "rHelpful": r.get("helpfulRating"),
-                    "rWouldTakeAgain": r.get("wouldTakeAgain"),
-                })
-
-            page_info = ratings.get("pageInfo") or {}
+            page_info = self._collect_ratings(data, reviews)
             if not page_info.get("hasNextPage"):
                 break
 
@@ -276,13 +335,34 @@ class RateMyProfApi:
 
         return reviews
 
+    @staticmethod
+    def _collect_ratings(data: Dict[str, Any], reviews: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Append one page of ratings to reviews and return its pageInfo."""
+        node = data.get("node") or {}
+        ratings = node.get("ratings") or {}
+        edges = ratings.get("edges") or []
+
+        for edge in edges:
+            r = (edge or {}).get("node") or {}
+            reviews.append({
+                "rClass": r.get("class") or "",
+                "rComments": r.get("comment") or "",
+                "rDate": r.get("date"),
+                "rEasy": r.get("difficultyRating"),
+                "rClarity": r.get("clarityRating"),
+                "rHelpful": r.get("helpfulRating"),
+                "rWouldTakeAgain": r.get("wouldTakeAgain"),
+            })
+
+        return ratings.get("pageInfo") or {}
+
     def get_professor_by_last_name(self, last_name: str) -> Professor:
         """Find a professor by last name."""
         last_name = last_name.lower().strip()
-        for prof in self.professors.values():
-            if prof.last_name.lower() == last_name:
-                return prof
-        raise ProfessorNotFound(last_name, "Last Name")
+        matches = self._by_last_name.get(last_name)
+        if not matches:
+            raise ProfessorNotFound(last_name, "Last Name")
+        return matches[0]
 
 
 # =============================================================================
@@ -294,6 +374,9 @@ class RMPApi:
     
     UVA_SCHOOL_ID = "1277"
     
+    # Upper bound on a single retry wait (seconds)
+    MAX_RETRY_DELAY = 30.0
+    
     def __init__(
         self,
         school_id: str = UVA_SCHOOL_ID,
@@ -319,6 +402,20 @@ class RMPApi:
         self.reviews_store = RMPStore(base)
         
         self._api: Optional[RateMyProfApi] = None
+        
+        # (tid, max_pages) -> raw reviews fetched this process, in front of the
+        # disk store so repeat lookups skip the network. Shared; don't mutate.
+        self._reviews_mem: LRUCache = LRUCache(maxsize=1000)
+        self._reviews_mem_lock = threading.Lock()
+        
+        # Parsed course maps: path -> (mtime_ns, map); reparsed only if the file changes
+        self._course_map_cache: Dict[str, Tuple[int, Dict[str, List[dict]]]] = {}
+        
+        # Snapshot of api.professors.items(), taken once per session
+        self._prof_items_cache: Optional[List[Tuple[int, Professor]]] = None
+        
+        # Professors marked processed after the last build_course_professor_map call
+        self.processed_count = 0
     
     @property
     def api(self) -> RateMyProfApi:
@@ -338,7 +435,10 @@ class RMPApi:
             return None
         
         compact = s.replace(" ", "")
-        m = re.match(r"^([A-Z]{2,4})(\d{4})$", compact)
+        # Valid codes are 6-8 characters; skip the regex for anything else
+        if not 6 <= len(compact) <= 8:
+            return None
+        m = _COURSE_RE.fullmatch(compact)
         if not m:
             return None
         
@@ -358,22 +458,87 @@ class RMPApi:
         max_pages: int,
         retries: int = 4,
         backoff: float = 1.6,
+        force_refresh: bool = False,
     ) -> List[Dict[str, Any]]:
-        """Fetch reviews with retry logic."""
+        """Fetch reviews with retry logic, memoized per (tid, max_pages).
+        
+        The returned list is shared with the in-memory cache; callers must
+        copy before modifying it.
+        """
+        key = (tid, max_pages)
+        if not force_refresh:
+            with self._reviews_mem_lock:
+                cached = self._reviews_mem.get(key)
+            if cached is not None:
+                return cached
+        
         last_err: Optional[Exception] = None
         for attempt in range(retries):
             try:
-                return self.api.create_reviews_list(tid, max_pages=max_pages)
+                reviews = self.api.create_reviews_list(tid, max_pages=max_pages)
             except (
                 requests.Timeout,
                 requests.ConnectionError,
                 requests.HTTPError,
+                requests.exceptions.RetryError,
                 RuntimeError,
             ) as e:
                 last_err = e
-                time.sleep(backoff ** attempt)
+                delay = self._retry_delay(e, attempt, backoff)
+                if delay is None:
+                    raise  # permanent client error (e.g. 404)
+                if attempt < retries - 1:
+                    time.sleep(delay)
+                continue
+            with self._reviews_mem_lock:
+                self._reviews_mem[key] = reviews
+            return reviews
         raise last_err  # type: ignore
     
+    @classmethod
+    def _retry_delay(cls, err: Exception, attempt: int, backoff: float) -> Optional[float]:
+        """Seconds to wait before retrying after err, or None if not retryable.
+        
+        429 responses honor Retry-After; everything else gets full-jitter
+        exponential backoff so concurrent fetchers don't retry in lockstep.
+        
+        Args:
+            err: Exception raised by the attempt
+            attempt: Zero-based attempt number
+            backoff: Exponential backoff base
+            
+        Returns:
+            Delay in seconds (capped at MAX_RETRY_DELAY), or None to give up
+        """
+        response = getattr(err, "response", None)
+        status = getattr(response, "status_code", None)
+        if isinstance(err, requests.HTTPError) and status is not None:
+            if status == 429:
+                delay = cls._parse_retry_after(response.headers.get("Retry-After", ""))
+                if delay is not None:
+                    return min(delay, cls.MAX_RETRY_DELAY)
+            elif status < 500 and status != 408:
+                return None
+        return random.uniform(0, min(backoff ** attempt, cls.MAX_RETRY_DELAY))
+    
+    @staticmethod
+    def _parse_retry_after(value: str) -> Optional[float]:
+        """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:  # "-0000" dates parse as naive; they're UTC
+            when = when.replace(tzinfo=timezone.utc)
+        return max(when.timestamp() - time.time(), 0.0)
+    
     def get_professor_reviews(
         self,
         tid: int,
@@ -397,18 +562,19 @@ class RMPApi:
         if not force_refresh and self.reviews_store.has_reviews(tid):
             return self.reviews_store.get_reviews(tid, limit=limit)
         
-        reviews = self._get_reviews_with_retries(tid, max_pages=max_pages)
+        reviews = self._get_reviews_with_retries(
+            tid, max_pages=max_pages, force_refresh=force_refresh
+        )
         
         if uva_only:
-            filtered: List[Dict[str, Any]] = []
-            for r in reviews:
-                norm = self.normalize_course(r.get("rClass"))
-                if not norm:
-                    continue
-                r2 = dict(r)
-                r2["rClass"] = norm
-                filtered.append(r2)
-            reviews = filtered
+            # Normalize and filter in one pass; build new dicts so the
+            # memoized raw reviews stay untouched
+            normalize = self.normalize_course
+            reviews = [
+                {**r, "rClass": norm}
+                for r in reviews
+                if (norm := normalize(r.get("rClass")))
+            ]
         
         professor = self.api.professors.get(tid)
         prof_name = professor.name if professor else "UNKNOWN"
@@ -427,94 +593,216 @@ class RMPApi:
         batch_size: int = 50,
         sleep_between_requests: float = 0.05,
         force_restart: bool = False,
+        flush_every: int = 25,
+        max_workers: int = 8,
     ) -> Dict[str, List[dict]]:
         """Build a mapping of courses to professors incrementally.
         
+        Each processed professor is appended to a small JSONL journal (flushed
+        every `flush_every` professors); the full course map and progress
+        snapshots are only rewritten (atomically) once per batch, or when the
+        batch is cut short by an error, after which the journal is cleared.
+        The course map is left untouched if the batch added no entries.
+        A process killed mid-batch replays the journal on the next call.
+        
+        Reviews for the batch are fetched on up to `max_workers` threads, with
+        request starts spaced `sleep_between_requests` apart; results are
+        merged in professor order, so the map is the same as a serial run.
+        
         Args:
             max_pages: Max pages per professor
             batch_size: Professors to process per call
-            sleep_between_requests: Delay between API calls
+            sleep_between_requests: Minimum delay between API call starts
             force_restart: Start fresh ignoring progress
+            flush_every: Professors between journal flushes
+            max_workers: Professors fetched concurrently
             
         Returns:
             Dict mapping course codes to list of professor info
         """
         course_map_path = self._cache_path("course_map", max_pages)
         progress_path = self._cache_path("progress", max_pages)
+        journal_path = os.path.splitext(progress_path)[0] + ".jsonl"
         
-        if os.path.exists(course_map_path) and not force_restart:
-            with open(course_map_path, "r", encoding="utf-8") as f:
-                course_map: Dict[str, List[dict]] = json.load(f)
-        else:
-            course_map = {}
+        if force_restart and os.path.exists(journal_path):
+            os.remove(journal_path)
+        
+        course_map = {} if force_restart else self._load_course_map(course_map_path)
         
         if os.path.exists(progress_path) and not force_restart:
-            with open(progress_path, "r", encoding="utf-8") as f:
-                progress = json.load(f)
+            progress = _read_json(progress_path)
             processed: set[int] = set(progress.get("processed_tids", []))
         else:
             processed = set()
         
-        course_map_dd: Dict[str, List[dict]] = defaultdict(list, course_map)
-        professor_items = list(self.api.professors.items())
+        # Copy the per-course lists so the cached map isn't mutated in place
+        course_map_dd: Dict[str, List[dict]] = defaultdict(list, {
+            course: list(professors) for course, professors in course_map.items()
+        })
+        # Course -> professor names already listed, for O(1) duplicate checks
+        course_profs: Dict[str, set] = defaultdict(set, {
+            course: {p.get("professor_name") for p in professors}
+            for course, professors in course_map.items()
+        })
+        
+        # Only re-encode the course map if this call actually changed it
+        dirty = force_restart
+        
+        def add_entry(course: str, entry: dict) -> bool:
+            nonlocal dirty
+            names = course_profs[course]
+            if entry["professor_name"] in names:
+                return False
+            names.add(entry["professor_name"])
+            course_map_dd[course].append(entry)
+            dirty = True
+            return True
+        
+        # Replay professors finished since the last snapshot
+        replayed = os.path.exists(journal_path)
+        if replayed:
+            with open(journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        record = _json_loads(line)
+                    except ValueError:
+                        break  # torn final write from an interrupted run
+                    processed.add(record["tid"])
+                    for course, entry in record["added"]:
+                        add_entry(course, entry)
+        
+        if force_restart or self._prof_items_cache is None:
+            self._prof_items_cache = list(self.api.professors.items())
         
         to_process: List[Tuple[int, Any]] = []
-        for tid, prof in professor_items:
+        for tid, prof in self._prof_items_cache:
             if tid in processed:
                 continue
             to_process.append((tid, prof))
             if len(to_process) >= batch_size:
                 break
         
+        def snapshot() -> Dict[str, List[dict]]:
+            # Rewrite both files (the course map only if it gained entries),
+            # then drop the replayed journal
+            result = dict(course_map_dd)
+            if dirty:
+                self._write_json_atomic(course_map_path, result)
+                self._course_map_cache[course_map_path] = (os.stat(course_map_path).st_mtime_ns, result)
+            self._write_json_atomic(progress_path, {"processed_tids": sorted(processed)})
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(journal_path)
+            return result
+        
         if not to_process:
-            with open(course_map_path, "w", encoding="utf-8") as f:
-                json.dump(dict(course_map_dd), f, ensure_ascii=False)
-            return dict(course_map_dd)
+            # Crawl already complete: only fold in a replayed journal (or a
+            # restart) rather than rewriting the snapshots on every call
+            result = snapshot() if replayed or force_restart else dict(course_map_dd)
+            self.processed_count = len(processed)
+            return result
         
-        for tid, prof in to_process:
+        # Shared rate limit: each fetch reserves the next start slot
+        throttle_lock = threading.Lock()
+        next_start = time.monotonic()
+        
+        def fetch(tid: int) -> List[Dict[str, Any]]:
+            nonlocal next_start
             if sleep_between_requests > 0:
-                time.sleep(sleep_between_requests)
-            
+                with throttle_lock:
+                    start = max(next_start, time.monotonic())
+                    next_start = start + sleep_between_requests
+                time.sleep(max(0.0, start - time.monotonic()))
             try:
-                reviews = self.get_professor_reviews(
+                return self.get_professor_reviews(
                     tid,
                     max_pages=max_pages,
                     uva_only=True,
                     force_refresh=False,
                 )
             except Exception:
-                processed.add(tid)
-                continue
-            
-            seen_courses = set()
-            for review in reviews:
-                course = review.get("rClass")
-                if not course or course in seen_courses:
-                    continue
-                seen_courses.add(course)
-                
-                already = any(
-                    p.get("professor_name") == prof.name
-                    for p in course_map_dd[course]
-                )
-                if already:
-                    continue
-                
-                course_map_dd[course].append({
-                    "professor_name": prof.name,
-                    "overall_rating": prof.overall_rating,
-                    "num_ratings": prof.num_of_ratings,
-                })
-            
-            processed.add(tid)
-            
-            with open(course_map_path, "w", encoding="utf-8") as f:
-                json.dump(dict(course_map_dd), f, ensure_ascii=False)
+                return []
+        
+        try:
+            with open(journal_path, "ab") as journal, \
+                    ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                all_reviews = executor.map(fetch, [tid for tid, _ in to_process])
+                for count, ((tid, prof), reviews) in enumerate(zip(to_process, all_reviews), 1):
+                    added: List[Tuple[str, dict]] = []
+                    prof_name = prof.name
+                    overall_rating = prof.overall_rating
+                    num_ratings = prof.num_of_ratings
+                    
+                    seen_courses = set()
+                    for review in reviews:
+                        course = review.get("rClass")
+                        if not course or course in seen_courses:
+                            continue
+                        seen_courses.add(course)
+                        
+                        entry = {
+                            "professor_name": prof_name,
+                            "overall_rating": overall_rating,
+                            "num_ratings": num_ratings,
+                        }
+                        if add_entry(course, entry):
+                            added.append((course, entry))
+                    
+                    processed.add(tid)
+                    
+                    journal.write(_json_dumps({"tid": tid, "added": added}) + b"\n")
+                    if count % flush_every == 0:
+                        journal.flush()
+        finally:
+            # Compact even on error/interrupt (the journal may not exist if
+            # opening it failed)
+            result = snapshot()
+        
+        self.processed_count = len(processed)
+        return result
+    
+    def _load_course_map(self, path: str) -> Dict[str, List[dict]]:
+        """Load a course map, reusing the parsed copy while the file is unchanged.
+        
+        Args:
+            path: Course map JSON path
             
-            with open(progress_path, "w", encoding="utf-8") as f:
-                json.dump({"processed_tids": sorted(processed)}, f, ensure_ascii=False)
+        Returns:
+            Course map (shared with the cache; do not mutate), or {} if missing
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        cached = self._course_map_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        course_map = _read_json(path)
+        self._course_map_cache[path] = (mtime, course_map)
+        return course_map
+    
+    @staticmethod
+    def _write_json_atomic(path: str, obj: Any) -> None:
+        """Write JSON to a temp file and rename it over path."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_json_dumps(obj))
+        os.replace(tmp_path, path)
+    
+    def get_processed_count(self, max_pages: int = 1) -> int:
+        """Count professors already recorded in the progress file.
         
-        return dict(course_map_dd)
+        Args:
+            max_pages: Max pages per professor (selects the progress file)
+            
+        Returns:
+            Number of processed professor IDs (0 if there is no progress yet)
+        """
+        progress_path = self._cache_path("progress", max_pages)
+        try:
+            progress = _read_json(progress_path)
+        except FileNotFoundError:
+            return 0
+        return len(progress.get("processed_tids", []))
     
     def get_professors_for_course(
         self,
@@ -9,21 +9,64 @@ Term codes:
     Examples: 1262 = Spring 2026, 1252 = Spring 2025, 1248 = Fall 2024
 """
 
+import asyncio
 import httpx
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Optional
 
+from app.data.sources._http import HTTP2_AVAILABLE, LIMITS, get_shared_client
 from app.data.stores import SISStore
+from app.data.stores.sis_store import SEARCH_TTL
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to httpx's stdlib json
+    orjson = None
 
 
 class SISApi:
     """Client for the UVA SIS course search API with caching."""
     
+    # Safety limit on result pages per subject
+    MAX_PAGES = 20
+    
     BASE_URL = "https://sisuva.admin.virginia.edu/psc/ihprd/UVSS/SA/s/WEBLIB_HCX_CM.H_CLASS_SEARCH.FieldFormula.IScript_ClassSearch"
     OPTIONS_URL = "https://sisuva.admin.virginia.edu/psc/ihprd/UVSS/SA/s/WEBLIB_HCX_CM.H_CLASS_SEARCH.FieldFormula.IScript_ClassSearchOptions"
     
-    def __init__(self, timeout: float = 30.0, cache_dir: str = "data/cache"):
-        self.client = httpx.Client(timeout=timeout, follow_redirects=True)
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        cache_dir: str = "data/cache",
+        cache_ttl: float = SEARCH_TTL,
+    ):
+        # Process-wide pooled client shared with the other data sources
+        self.client = get_shared_client()
+        self.timeout = timeout
+        # Async counterpart, created lazily on the event loop that first uses it
+        self.async_client: Optional[httpx.AsyncClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
         self.store = SISStore(cache_dir)
+        # Max age (seconds) of a cached search response before it is refetched
+        self.cache_ttl = cache_ttl
+    
+    async def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the shared async client, creating it on first use.
+        
+        httpx async connections are bound to the loop that opened them, so a
+        client left over from a different (e.g. finished asyncio.run) loop is
+        replaced rather than reused.
+        """
+        loop = asyncio.get_running_loop()
+        if self.async_client is None or self._async_loop is not loop:
+            self.async_client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=LIMITS,
+            )
+            self._async_loop = loop
+        return self.async_client
     
     def search(
         self,
@@ -33,8 +76,9 @@ class SISApi:
         instructor: Optional[str] = None,
         term: str = "1262",
         page: int = 1,
+        use_cache: bool = True,
     ) -> dict:
-        """Search for courses in SIS.
+        """Search for courses in SIS with caching.
         
         Args:
             subject: Subject code (e.g., "CS", "MATH")
@@ -43,10 +87,71 @@ class SISApi:
             instructor: Instructor last name
             term: Academic term code (default: Spring 2026)
             page: Results page number
+            use_cache: Whether to use a cached response if available
             
         Returns:
-            Raw API response dictionary
+            Raw API response dictionary (shared when cached; do not mutate)
         """
+        params = self._search_params(subject, catalog_number, keyword, instructor, term, page)
+        
+        if use_cache:
+            cached = self.store.load_search(params, ttl=self.cache_ttl)
+            if cached is not None:
+                return cached
+        
+        response = self.client.get(self.BASE_URL, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        data = self._parse_json(response)
+        
+        self.store.save_search(params, data, body=response.content)
+        return data
+    
+    async def search_async(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        subject: Optional[str] = None,
+        catalog_number: Optional[str] = None,
+        keyword: Optional[str] = None,
+        instructor: Optional[str] = None,
+        term: str = "1262",
+        page: int = 1,
+        use_cache: bool = True,
+    ) -> dict:
+        """Async version of search (same cache); uses the shared async client by default."""
+        params = self._search_params(subject, catalog_number, keyword, instructor, term, page)
+        
+        if use_cache:
+            cached = self.store.load_search(params, ttl=self.cache_ttl)
+            if cached is not None:
+                return cached
+        
+        if client is None:
+            client = await self._get_async_client()
+        response = await client.get(self.BASE_URL, params=params)
+        response.raise_for_status()
+        # Decode in a worker thread so it overlaps other requests' network waits
+        data = await asyncio.to_thread(self._parse_json, response)
+        
+        self.store.save_search(params, data, body=response.content)
+        return data
+    
+    @staticmethod
+    def _parse_json(response: httpx.Response):
+        """Decode a JSON response body (orjson when available)."""
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+    
+    @staticmethod
+    def _search_params(
+        subject: Optional[str],
+        catalog_number: Optional[str],
+        keyword: Optional[str],
+        instructor: Optional[str],
+        term: str,
+        page: int,
+    ) -> dict:
+        """Build SIS class search query parameters."""
         params = {
             "institution": "UVA01",
             "term": term,
@@ -62,9 +167,7 @@ class SISApi:
         if instructor:
             params["instructor_name"] = instructor
         
-        response = self.client.get(self.BASE_URL, params=params)
-        response.raise_for_status()
-        return response.json()
+        return params
     
     def get_classes_list(self, api_response) -> list:
         """Extract classes list from API response.
@@ -108,34 +211,95 @@ class SISApi:
                 on_progress("CACHE", 0, len(courses))
             return courses
         
-        # Fetch from API
-        all_courses = []
+        # Fetch from API (subjects concurrently)
+        async def run() -> list[dict]:
+            try:
+                return await self.fetch_all_courses_async(
+                    subjects, term, on_progress=on_progress, use_cache=use_cache
+                )
+            finally:
+                # The private loop ends here, so its connections can't be reused
+                await self.aclose()
         
-        for subject in subjects:
-            page = 1
-            while True:
-                try:
-                    response = self.search(subject=subject, term=term, page=page)
-                    classes = self.get_classes_list(response)
-                    
-                    if not classes:
-                        break
-                    
-                    all_courses.extend(classes)
-                    
-                    if on_progress:
-                        on_progress(subject, page, len(classes))
-                    
-                    page += 1
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(run())
+        # Called from a thread that's already running an event loop (e.g.
+        # directly inside an async endpoint); asyncio.run can't nest there,
+        # so run the fetch on its own loop in a worker thread
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, run()).result()
+    
+    async def fetch_all_courses_async(
+        self,
+        subjects: list[str],
+        term: str = "1262",
+        on_progress: callable = None,
+        use_cache: bool = True,
+        concurrency: int = 8,
+        page_window: int = 4,
+        max_requests: int = 8,
+    ) -> list[dict]:
+        """Fetch all courses for given subjects from the API, subjects in parallel.
+        
+        The API doesn't report a page count, so after page 1 each subject
+        speculatively requests the next `page_window` pages at once and stops
+        at the first empty page; different subjects run concurrently on the
+        shared pooled async client. In-flight HTTP requests are capped at
+        `max_requests` overall so SIS isn't flooded into rate limiting. The
+        result is saved as the term's cache.
+        
+        Args:
+            subjects: List of subject codes to fetch
+            term: Academic term code
+            on_progress: Optional callback(subject, page, count) for progress updates
+            use_cache: Whether to use cached search responses if available
+            concurrency: Max subjects fetched at once
+            page_window: Pages requested concurrently per subject after page 1
+            max_requests: Max SIS requests in flight across all subjects
+            
+        Returns:
+            List of all course dictionaries, grouped by subject in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        request_sem = asyncio.Semaphore(max_requests)
+        
+        client = await self._get_async_client()
+        
+        async def fetch_subject(subject: str) -> list[dict]:
+            courses = []
+            async with semaphore:
+                # Page 1 alone (most subjects fit on it), then windows of pages
+                page, window = 1, 1
+                while page <= self.MAX_PAGES:
+                    pages = range(page, min(page + window, self.MAX_PAGES + 1))
+                    responses = await self._fetch_pages(
+                        client, subject, term, pages, request_sem, use_cache
+                    )
                     
-                    # Safety limit
-                    if page > 20:
-                        break
+                    # Keep pages in order up to the first error or empty page
+                    for p, response in zip(pages, responses):
+                        if isinstance(response, Exception):
+                            if on_progress:
+                                on_progress(subject, p, 0, error=str(response))
+                            return courses
                         
-                except Exception as e:
-                    if on_progress:
-                        on_progress(subject, page, 0, error=str(e))
-                    break
+                        classes = self.get_classes_list(response)
+                        if not classes:
+                            return courses
+                        
+                        courses.extend(classes)
+                        if on_progress:
+                            on_progress(subject, p, len(classes))
+                    
+                    page += len(pages)
+                    window = max(1, page_window)
+            return courses
+        
+        per_subject = await asyncio.gather(*(fetch_subject(s) for s in subjects))
+        
+        all_courses = [course for courses in per_subject for course in courses]
         
         # Save to cache
         if all_courses:
@@ -143,6 +307,30 @@ class SISApi:
         
         return all_courses
     
+    async def _fetch_pages(
+        self,
+        client: httpx.AsyncClient,
+        subject: str,
+        term: str,
+        pages: range,
+        sem: asyncio.Semaphore,
+        use_cache: bool = True,
+    ) -> list:
+        """Fetch a window of result pages for one subject concurrently.
+        
+        Each request holds `sem` only while it is in flight.
+        
+        Returns:
+            Responses in page order; failed pages are returned as exceptions
+        """
+        async def fetch(page: int):
+            async with sem:
+                return await self.search_async(
+                    client, subject=subject, term=term, page=page, use_cache=use_cache
+                )
+        
+        return await asyncio.gather(*(fetch(p) for p in pages), return_exceptions=True)
+    
     def extract_instructor(self, course: dict) -> str:
         """Extract primary instructor name from course data."""
         instructors = course.get("instructors", [])
@@ -150,10 +338,13 @@ class SISApi:
             return instructors[0].get("name", "Staff")
         return "Staff"
     
-    def format_time(self, time_str: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def format_time(time_str: str) -> str:
         """Format SIS time string to readable format.
         
-        Converts "09.00.00.000000" to "9am", "14.30.00.000000" to "2:30pm"
+        Converts "09.00.00.000000" to "9am", "14.30.00.000000" to "2:30pm".
+        SIS uses a small set of distinct times, so results are memoized.
         
         Args:
             time_str: Time string in format "HH.MM.SS.ffffff"
@@ -183,8 +374,13 @@ class SISApi:
             return time_str
     
     def close(self):
-        """Close the HTTP client."""
-        self.client.close()
+        """Release the client (the shared sync pool stays open for other users)."""
+    
+    async def aclose(self):
+        """Close the shared async client, if one was created."""
+        if self.async_client is not None:
+            client, self.async_client, self._async_loop = self.async_client, None, None
+            await client.aclose()
     
     def __enter__(self):
         return self
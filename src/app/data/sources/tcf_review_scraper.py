@@ -1,14 +1,37 @@
-import requests
+import re
 from bs4 import BeautifulSoup
 import time
+from typing import Optional
+
+from app.data.sources._http import get_shared_client
 
 HEADERS = {
     "User-Agent": "UVA-Course-Advising-Project/1.0 (academic use)"
 }
 
+# Matches TCF profile links like "/course/14940/4710/" -> (course_id, instructor_id)
+_PROFILE_URL_RE = re.compile(r'/course/(\d+)/(\d+)/')
+
+def extract_course_id(text: str) -> Optional[int]:
+    """Extract the TCF course ID from a profile URL or raw page HTML.
+    
+    Runs a single regex search over the raw string, so no HTML parsing is
+    needed when only the ID is required.
+    
+    Args:
+        text: Profile URL (e.g., "https://thecourseforum.com/course/594/13208/") or page HTML
+        
+    Returns:
+        course_id (e.g., 594) or None if not found
+    """
+    match = _PROFILE_URL_RE.search(text or "")
+    if not match:
+        return None
+    return int(match.group(1))
+
 def fetch_page(url: str) -> BeautifulSoup:
     """Fetch a page and return BeautifulSoup object."""
-    resp = requests.get(url, headers=HEADERS, timeout=10)
+    resp = get_shared_client().get(url, headers=HEADERS, timeout=10)
     resp.raise_for_status()
     return BeautifulSoup(resp.text, "html.parser")
 
@@ -131,15 +154,14 @@ def scrape_reviews_for_instructor_data(instructor_data: dict, course_id: int):
         }
     
     # Parse instructor ID from URL
-    import re
-    match = re.search(r'/course/\d+/(\d+)/', profile_url)
+    match = _PROFILE_URL_RE.search(profile_url)
     if not match:
         return {
             **instructor_data,
             "reviews": []
         }
     
-    instructor_id = int(match.group(1))
+    instructor_id = int(match.group(2))
     
     # Scrape reviews
     reviews = scrape_instructor_reviews(course_id, instructor_id)
@@ -3,10 +3,10 @@
 Scrapes instructor ratings, difficulty scores, and GPA data from TheCourseForum.
 """
 
-import requests
 from bs4 import BeautifulSoup
 from typing import Optional
 
+from app.data.sources._http import get_shared_client
 from app.data.stores import TCFStore
 
 
@@ -21,6 +21,8 @@ class TCFScraper:
     
     def __init__(self, timeout: float = 10.0, cache_dir: str = "data/cache"):
         self.timeout = timeout
+        # Process-wide pooled client shared with the other data sources
+        self.client = get_shared_client()
         self.store = TCFStore(cache_dir)
     
     def get_course_reviews(
@@ -39,9 +41,11 @@ class TCFScraper:
         Returns:
             List of instructor review dictionaries
         """
-        # Check cache first
-        if use_cache and self.store.has(subject, catalog_number):
-            return self.store.load(subject, catalog_number)
+        # Check cache first (single dict lookup, no HTTP or HTML parsing)
+        if use_cache:
+            cached = self.store.get(subject, catalog_number)
+            if cached is not None:
+                return cached
         
         # Fetch from web
         url = f"{self.BASE_URL}/{subject}/{catalog_number}/All"
@@ -83,7 +87,7 @@ class TCFScraper:
         Returns:
             BeautifulSoup object
         """
-        resp = requests.get(url, headers=self.HEADERS, timeout=self.timeout)
+        resp = self.client.get(url, headers=self.HEADERS, timeout=self.timeout)
         resp.raise_for_status()
         return BeautifulSoup(resp.text, "html.parser")
     
@@ -1,12 +1,40 @@
-"""Data persistence stores for caching API responses."""
+"""Data persistence stores for caching API responses.
+
+Stores are imported lazily on first attribute access so that importing one
+store (e.g. from a CLI script) doesn't pull in the others.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "RMPStore": ".rmp_store",
+    "SISStore": ".sis_store",
+    "HooslistStore": ".hooslist_store",
+    "TCFStore": ".tcf_store",
+    "RMPReviewsLoader": ".rmp_reviews_loader",
+    "get_rmp_loader": ".rmp_reviews_loader",
+    "TCFReviewsLoader": ".tcf_reviews_loader",
+    "get_tcf_loader": ".tcf_reviews_loader",
+    "TCFInstructorReviewsStore": ".tcf_instructor_reviews_store",
+    "CacheDB": ".cache_db",
+    "get_cache_db": ".cache_db",
+}
+
+
+def __getattr__(name):
+    """Lazy imports to defer loading stores until they are used."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
 
-from .rmp_store import RMPStore
-from .sis_store import SISStore
-from .hooslist_store import HooslistStore
-from .tcf_store import TCFStore
-from .rmp_reviews_loader import RMPReviewsLoader, get_rmp_loader
-from .tcf_reviews_loader import TCFReviewsLoader, get_tcf_loader
-from .tcf_instructor_reviews_store import TCFInstructorReviewsStore
 
 __all__ = [
     "RMPStore",
@@ -18,5 +46,6 @@ __all__ = [
     "TCFReviewsLoader",
     "get_tcf_loader",
     "TCFInstructorReviewsStore",
+    "CacheDB",
+    "get_cache_db",
 ]
-
@@ -0,0 +1,69 @@
+"""Shared SQLite database for small cache entries.
+
+Caches with many small records (Hooslist descriptions, SIS search responses)
+live as tables in one `cache.db` per cache directory instead of one JSON file
+per entry or one JSON file rewritten on every save.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Optional
+
+
+class CacheDB:
+    """Thread-safe wrapper around a single SQLite connection."""
+
+    FILENAME = "cache.db"
+
+    def __init__(self, cache_dir: str = "data/cache"):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, self.FILENAME)
+        self._lock = threading.RLock()
+        # Autocommit mode; multi-statement writes go through transaction()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # WAL + NORMAL: one fsync per checkpoint rather than per commit
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Bookkeeping shared by the stores (e.g. one-time migrations)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value TEXT)"
+        )
+
+    def execute(self, sql: str, params: Iterable[Any] = ()) -> list[tuple]:
+        """Run one statement and return all result rows."""
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def fetchone(self, sql: str, params: Iterable[Any] = ()) -> Optional[tuple]:
+        """Run one statement and return its first row (or None)."""
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchone()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Group several writes into a single BEGIN ... COMMIT."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache(maxsize=None)
+def _get_cache_db(path: str) -> CacheDB:
+    return CacheDB(path)
+
+
+def get_cache_db(cache_dir: str = "data/cache") -> CacheDB:
+    """Get the shared CacheDB for a cache directory (one connection per process)."""
+    return _get_cache_db(os.path.abspath(cache_dir))
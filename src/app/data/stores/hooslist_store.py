@@ -1,45 +1,96 @@
-"""Hooslist API data store - caches course descriptions as JSON."""
+"""Hooslist API data store - caches course descriptions in SQLite."""
 
 import json
 import os
+import time
 from typing import Optional
 
+from app.data.stores.cache_db import get_cache_db
+
 
 class HooslistStore:
-    """Simple JSON cache for Hooslist descriptions."""
+    """SQLite cache for Hooslist descriptions (table `hooslist_desc`)."""
+
+    # Pre-SQLite cache file (checked in as seed data), imported on first use
+    LEGACY_FILENAME = "hooslist_descriptions.json"
 
     def __init__(self, cache_dir: str = "data/cache"):
         self.cache_dir = cache_dir
-        os.makedirs(cache_dir, exist_ok=True)
-        self.path = os.path.join(cache_dir, "hooslist_descriptions.json")
-        self.data = self._load()
-    
-    def _load(self) -> dict:
-        if os.path.exists(self.path):
-            with open(self.path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return {}
-    
-    def _save(self) -> None:
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=2)
-    
-    def _key(self, subject: str, catalog_number: str) -> str:
-        return f"{subject.upper()}_{catalog_number}"
-    
-    def has(self, subject: str, catalog_number: str) -> bool:
-        return self._key(subject, catalog_number) in self.data
-    
+        self.db = get_cache_db(cache_dir)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS hooslist_desc ("
+            " subject TEXT NOT NULL,"
+            " num TEXT NOT NULL,"
+            " ts REAL,"
+            " description TEXT NOT NULL,"
+            " prerequisites TEXT NOT NULL,"
+            " PRIMARY KEY (subject, num))"
+        )
+        self._migrate_json(os.path.join(cache_dir, self.LEGACY_FILENAME))
+
+    def _migrate_json(self, path: str) -> None:
+        """Import the old JSON cache file once, in a single transaction.
+
+        The file is left in place, since the repository ships it; a marker in
+        cache_meta keeps it from being re-imported (e.g. after clear()).
+        """
+        if not os.path.exists(path) or self.db.fetchone(
+            "SELECT 1 FROM cache_meta WHERE name = ?", (self.LEGACY_FILENAME,)
+        ):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        rows = []
+        for key, entry in data.items():
+            subject, _, num = key.partition("_")
+            rows.append((
+                subject,
+                num,
+                entry.get("fetched_at"),
+                entry.get("description", ""),
+                entry.get("prerequisites", ""),
+            ))
+
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO hooslist_desc VALUES (?, ?, ?, ?, ?)", rows
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_meta VALUES (?, ?)",
+                (self.LEGACY_FILENAME, str(time.time())),
+            )
+        print(f"[HOOSLIST] Imported {len(rows)} cached descriptions into {self.db.path}")
+
+    def has(self, subject: str, catalog_number: str, max_age: Optional[float] = None) -> bool:
+        return self.load(subject, catalog_number, max_age) is not None
+
     def save(self, subject: str, catalog_number: str, description: str, prerequisites: str = "") -> None:
-        self.data[self._key(subject, catalog_number)] = {
+        self.db.execute(
+            "INSERT OR REPLACE INTO hooslist_desc VALUES (?, ?, ?, ?, ?)",
+            (subject.upper(), catalog_number, time.time(), description, prerequisites),
+        )
+
+    def load(self, subject: str, catalog_number: str, max_age: Optional[float] = None) -> Optional[dict]:
+        """Get a cached entry, or None if missing or older than max_age seconds.
+
+        Entries saved before timestamps were recorded never expire.
+        """
+        row = self.db.fetchone(
+            "SELECT ts, description, prerequisites FROM hooslist_desc"
+            " WHERE subject = ? AND num = ?",
+            (subject.upper(), catalog_number),
+        )
+        if row is None:
+            return None
+        fetched_at, description, prerequisites = row
+        if max_age is not None and fetched_at is not None and time.time() - fetched_at > max_age:
+            return None
+        return {
             "description": description,
             "prerequisites": prerequisites,
+            "fetched_at": fetched_at,
         }
-        self._save()
-    
-    def load(self, subject: str, catalog_number: str) -> Optional[dict]:
-        return self.data.get(self._key(subject, catalog_number))
-    
+
     def clear(self) -> None:
-        self.data = {}
-        self._save()
+        self.db.execute("DELETE FROM hooslist_desc")
@@ -6,9 +6,18 @@ generate AI-powered summaries of reviews.
 
 import json
 import os
+import sys
+from functools import lru_cache
+from itertools import islice
 from typing import Optional
 
 
+@lru_cache(maxsize=4096)
+def _name_key(name: str) -> str:
+    """Normalize a professor name to its interned lookup key."""
+    return sys.intern(name.lower().strip())
+
+
 class RMPReviewsLoader:
     """Loads and searches RateMyProfessor reviews from cache."""
     
@@ -37,12 +46,10 @@ class RMPReviewsLoader:
                     review = json.loads(line)
                     self._reviews.append(review)
                     
-                    # Index by professor name (lowercase)
-                    prof_name = review.get("professor_name", "").lower().strip()
-                    if prof_name:
-                        if prof_name not in self._by_professor:
-                            self._by_professor[prof_name] = []
-                        self._by_professor[prof_name].append(review)
+                    # Index by professor name (normalized once, interned)
+                    prof_key = _name_key(review.get("professor_name", ""))
+                    if prof_key:
+                        self._by_professor.setdefault(prof_key, []).append(review)
                 except json.JSONDecodeError:
                     continue
         
@@ -64,13 +71,8 @@ class RMPReviewsLoader:
         """
         self._load()
         
-        name_lower = professor_name.lower().strip()
-        
         # Exact match only
-        if name_lower in self._by_professor:
-            return self._by_professor[name_lower][:limit]
-        
-        return []
+        return self._by_professor.get(_name_key(professor_name), [])[:limit]
     
     def get_reviews_for_course_instructor(
         self,
@@ -184,7 +186,6 @@ class RMPReviewsLoader:
         helpful_scores = []
         difficulty_scores = []
         would_take_again = []
-        comments = []
         
         for review in reviews:
             if review.get("rClarity"):
@@ -195,8 +196,12 @@ class RMPReviewsLoader:
                 difficulty_scores.append(review["rEasy"])
             if review.get("rWouldTakeAgain") is not None:
                 would_take_again.append(1 if review["rWouldTakeAgain"] else 0)
-            if review.get("rComments"):
-                comments.append(review["rComments"][:200])
+        
+        # Only the first few comments are kept, so stop truncating once we have them
+        comments = list(islice(
+            (review["rComments"][:200] for review in reviews if review.get("rComments")),
+            3,
+        ))
         
         def avg(lst):
             return round(sum(lst) / len(lst), 2) if lst else None
@@ -208,7 +213,7 @@ class RMPReviewsLoader:
             "avg_helpful": avg(helpful_scores),
             "avg_difficulty": avg(difficulty_scores),
             "would_take_again_pct": round(100 * avg(would_take_again)) if would_take_again else None,
-            "sample_comments": comments[:3],
+            "sample_comments": comments,
         }
 
 
@@ -2,8 +2,14 @@
 
 import json
 import os
+import threading
 from typing import List
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json
+    orjson = None
+
 
 class RMPStore:
     """Simple JSON cache for RateMyProfessor reviews."""
@@ -17,26 +23,34 @@ class RMPStore:
         self.path = base_path + ".json"
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
         self.data = self._load()
+        # Reviews may be appended from several fetch threads at once
+        self._lock = threading.Lock()
     
     def _load(self) -> dict:
         if os.path.exists(self.path):
-            with open(self.path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
         return {}
     
     def _save(self) -> None:
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(self.path, "wb") as f:
+                f.write(orjson.dumps(self.data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, ensure_ascii=False, indent=2)
     
     def has_reviews(self, tid: int) -> bool:
         return str(tid) in self.data
     
     def append_reviews(self, tid: int, professor_name: str, reviews: List[dict]) -> None:
-        self.data[str(tid)] = {
-            "professor_name": professor_name,
-            "reviews": reviews,
-        }
-        self._save()
+        with self._lock:
+            self.data[str(tid)] = {
+                "professor_name": professor_name,
+                "reviews": reviews,
+            }
+            self._save()
     
     def get_reviews(self, tid: int, limit: int = 200) -> List[dict]:
         entry = self.data.get(str(tid))
@@ -45,5 +59,6 @@ class RMPStore:
         return entry.get("reviews", [])[:limit]
     
     def clear(self) -> None:
-        self.data = {}
-        self._save()
+        with self._lock:
+            self.data = {}
+            self._save()
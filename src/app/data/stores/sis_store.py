@@ -1,8 +1,33 @@
-"""SIS API data store - caches course data as JSON."""
+"""SIS API data store - caches term course data as JSON, searches in SQLite."""
 
+import gzip
+import hashlib
 import json
 import os
-from typing import Any, List
+import threading
+import time
+from typing import Any, List, Optional
+
+from cachetools import TTLCache
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json
+    orjson = None
+
+from app.data.stores.cache_db import get_cache_db
+
+# SIS search results barely change within a term, so keep them for a week
+SEARCH_TTL = 7 * 24 * 3600
+
+# In-process layer over the on-disk search cache, shared by all stores:
+# (db path, key) -> (fetched_at, response)
+_search_memo: TTLCache = TTLCache(maxsize=256, ttl=SEARCH_TTL)
+# cachetools caches aren't thread-safe; searches run from the threadpool
+_search_memo_lock = threading.Lock()
+
+# Parsed term files: path -> (mtime, courses); reloaded when the file changes
+_term_memo: dict[str, tuple[float, List[dict]]] = {}
 
 
 class SISStore:
@@ -11,6 +36,39 @@ class SISStore:
     def __init__(self, cache_dir: str = "data/cache"):
         self.cache_dir = cache_dir
         os.makedirs(cache_dir, exist_ok=True)
+        self.db = get_cache_db(cache_dir)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS sis_search ("
+            " key TEXT PRIMARY KEY,"
+            " ts REAL NOT NULL,"
+            " response BLOB NOT NULL)"
+        )
+        self._migrate_search_files(os.path.join(cache_dir, "sis_search"))
+    
+    def _migrate_search_files(self, search_dir: str) -> None:
+        """Import the old one-file-per-search cache, then remove it."""
+        if not os.path.isdir(search_dir):
+            return
+        
+        rows = []
+        paths = []
+        for name in os.listdir(search_dir):
+            path = os.path.join(search_dir, name)
+            paths.append(path)
+            if not name.endswith(".json.gz"):
+                continue  # leftover .tmp from an interrupted write
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    rows.append((name[:-len(".json.gz")], os.path.getmtime(path), f.read()))
+            except OSError:
+                continue
+        
+        with self.db.transaction() as conn:
+            conn.executemany("INSERT OR IGNORE INTO sis_search VALUES (?, ?, ?)", rows)
+        for path in paths:
+            os.remove(path)
+        os.rmdir(search_dir)
+        print(f"[SIS] Migrated {len(rows)} cached searches to {self.db.path}")
     
     def _path(self, term: str) -> str:
         return os.path.join(self.cache_dir, f"sis_courses_{term}.json")
@@ -19,14 +77,28 @@ class SISStore:
         return os.path.exists(self._path(term))
     
     def save(self, term: str, courses: List[dict]) -> None:
-        with open(self._path(term), "w", encoding="utf-8") as f:
-            json.dump(courses, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(self._path(term), "wb") as f:
+                f.write(orjson.dumps(courses, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self._path(term), "w", encoding="utf-8") as f:
+                json.dump(courses, f, ensure_ascii=False, indent=2)
     
     def load(self, term: str) -> List[dict]:
-        if not self.has(term):
+        """Load a term's courses (parsed once per file version; do not mutate)."""
+        path = self._path(term)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
             return []
-        with open(self._path(term), "r", encoding="utf-8") as f:
-            return json.load(f)
+        cached = _term_memo.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(path, "rb") as f:
+            raw = f.read()
+        courses = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        _term_memo[path] = (mtime, courses)
+        return courses
     
     def clear(self, term: str = None) -> None:
         if term:
@@ -37,3 +109,53 @@ class SISStore:
             for f in os.listdir(self.cache_dir):
                 if f.startswith("sis_courses_"):
                     os.remove(os.path.join(self.cache_dir, f))
+    
+    def _search_key(self, params: dict) -> str:
+        """Stable hash of a search's query parameters (includes the term)."""
+        raw = json.dumps(sorted(params.items()), separators=(",", ":"))
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def load_search(self, params: dict, ttl: int = SEARCH_TTL) -> Optional[Any]:
+        """Get a cached search response, or None if missing or older than ttl."""
+        key = self._search_key(params)
+        memo_key = (self.db.path, key)
+        with _search_memo_lock:
+            memo = _search_memo.get(memo_key)
+        if memo is not None:
+            fetched_at, response = memo
+            return response if time.time() - fetched_at <= ttl else None
+        
+        row = self.db.fetchone("SELECT ts, response FROM sis_search WHERE key = ?", (key,))
+        if row is None or time.time() - row[0] > ttl:
+            return None
+        try:
+            response = orjson.loads(row[1]) if orjson is not None else json.loads(row[1])
+        except ValueError:
+            return None
+        
+        with _search_memo_lock:
+            _search_memo[memo_key] = (row[0], response)
+        return response
+    
+    def save_search(self, params: dict, response: Any, body: Optional[bytes] = None) -> None:
+        """Cache a search response in memory and in the cache database.
+        
+        Args:
+            params: Search query parameters (the cache key)
+            response: Parsed response, kept in memory for repeat lookups
+            body: Raw JSON body as received; stored as-is to skip re-encoding
+        """
+        key = self._search_key(params)
+        fetched_at = time.time()
+        with _search_memo_lock:
+            _search_memo[(self.db.path, key)] = (fetched_at, response)
+        
+        if body is None:
+            if orjson is not None:
+                body = orjson.dumps(response)
+            else:
+                body = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        self.db.execute(
+            "INSERT OR REPLACE INTO sis_search VALUES (?, ?, ?)",
+            (key, fetched_at, body),
+        )
@@ -1,17 +1,56 @@
 """TCF Reviews Loader - loads instructor reviews from cached JSON."""
 
 import json
+import mmap
 import os
+import pickle
+import sys
 from typing import Optional
 from functools import lru_cache
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # rapidfuzz is optional; fuzzy matching is skipped
+    process = None
+
 
 class TCFReviewsLoader:
     """Loads TCF instructor reviews from cache and matches by course + instructor."""
     
+    # Bump when the slimmed data/index layout changes to invalidate old sidecars
+    SIDECAR_VERSION = 3
+    
+    # Minimum rapidfuzz token_sort_ratio for the fuzzy name fallback; kept high
+    # because different instructors of one course often have similar names
+    FUZZY_SCORE_CUTOFF = 90
+    
     def __init__(self, cache_path: str = "data/cache/tcf_instructor_reviews.json"):
         self.cache_path = cache_path
-        self.data = self._load()
+        self.sidecar_path = cache_path + ".pkl"
+        
+        cached = self._load_sidecar()
+        if cached is not None:
+            self.data, self._index, self._by_name = cached
+        else:
+            self.data = self._load()
+            self._index, self._by_name = self._build_index()
+            if self.data:
+                self._save_sidecar()
+        
+        # Memoize read-only lookups per instance; the RAG path repeats the same
+        # (subject, catalog, instructor) triples. Results must not be mutated.
+        self.get_reviews_for_instructor = lru_cache(maxsize=2048)(self.get_reviews_for_instructor)
+        self.summarize_instructor = lru_cache(maxsize=2048)(self.summarize_instructor)
+    
+    def clear_cache(self) -> None:
+        """Clear memoized lookups (call after reloading the cache file)."""
+        self.get_reviews_for_instructor.cache_clear()
+        self.summarize_instructor.cache_clear()
     
     def _load(self) -> dict:
         """Load TCF reviews from JSON file."""
@@ -20,19 +59,102 @@ class TCFReviewsLoader:
             return {}
         
         try:
+            if orjson is not None:
+                # Parse straight from the page cache instead of copying the
+                # whole file into a bytes object first
+                with open(self.cache_path, "rb") as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                        memoryview(mm) as view:
+                    return orjson.loads(view)
             with open(self.cache_path, "r", encoding="utf-8") as f:
                 return json.load(f)
         except Exception as e:
             print(f"[TCF] Error loading cache: {e}")
             return {}
     
+    def _load_sidecar(self) -> Optional[tuple[dict, dict, dict]]:
+        """Load the prebuilt (data, indexes) pickle if it is newer than the JSON cache."""
+        try:
+            if os.path.getmtime(self.sidecar_path) < os.path.getmtime(self.cache_path):
+                return None
+            with open(self.sidecar_path, "rb") as f:
+                version, *state = pickle.load(f)
+        except Exception:
+            return None
+        if version != self.SIDECAR_VERSION:
+            return None
+        return tuple(state)
+    
+    def _save_sidecar(self) -> None:
+        """Persist the slimmed data and indexes so later startups skip JSON parsing."""
+        tmp_path = self.sidecar_path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(
+                    (self.SIDECAR_VERSION, self.data, self._index, self._by_name),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, self.sidecar_path)
+        except Exception as e:
+            print(f"[TCF] Could not write cache sidecar: {e}")
+    
+    def _build_index(self) -> tuple[dict[tuple[str, str, str], list[dict]], dict[tuple[str, str], dict]]:
+        """Slim the loaded data and index instructors for lookup.
+        
+        Returns two indexes: (course key, normalized last name, first initial)
+        -> instructors in cache order, and (course key, normalized full name) -> first
+        instructor with that exact name.
+        
+        Each instructor is reduced to the fields the lookup path reads, plus its
+        normalized name, name parts, and spam-filtered review texts, so the raw
+        review dicts are released and lookups never redo that work.
+        """
+        index: dict[tuple[str, str, str], list[dict]] = {}
+        by_name: dict[tuple[str, str], dict] = {}
+        slimmed: dict[str, dict] = {}
+        for key, course_data in self.data.items():
+            # Interned so lookups with _key() results compare by identity
+            key = sys.intern(key)
+            slim_instructors = []
+            for inst in course_data.get("instructors", []):
+                reviews = inst.get("reviews", [])
+                norm_name = sys.intern(self._normalize_name(inst.get("instructor_name") or ""))
+                slim = {
+                    "instructor_name": inst.get("instructor_name", ""),
+                    "rating": inst.get("rating"),
+                    "difficulty": inst.get("difficulty"),
+                    "gpa": inst.get("gpa"),
+                    "review_count": inst.get("review_count", len(reviews)),
+                    "_norm_name": norm_name,
+                    "_norm_parts": norm_name.split(),
+                    "_valid_reviews": [
+                        text
+                        for text in (r.get("text", "") for r in reviews)
+                        if self._is_valid_review(text)
+                    ],
+                }
+                slim_instructors.append(slim)
+                parts = slim["_norm_parts"]
+                if parts:
+                    index.setdefault((key, parts[-1], parts[0][:1]), []).append(slim)
+                    by_name.setdefault((key, norm_name), slim)
+            slimmed[key] = {"instructors": slim_instructors}
+        self.data = slimmed
+        return index, by_name
+    
+    @staticmethod
+    def _is_valid_review(text: str) -> bool:
+        """Filter out spam/test reviews."""
+        return len(text) > 50 and "app app app" not in text.lower()
+    
     def _normalize_name(self, name: str) -> str:
         """Normalize instructor name for matching."""
         return name.lower().strip()
     
     def _key(self, subject: str, catalog_number: str) -> str:
         """Generate cache key for a course."""
-        return f"{subject.upper()}_{catalog_number}"
+        return sys.intern(f"{subject.upper()}_{catalog_number}")
     
     def get_course_instructors(self, subject: str, catalog_number: str) -> list[dict]:
         """Get all instructors for a course.
@@ -42,7 +164,7 @@ class TCFReviewsLoader:
             catalog_number: Course number (e.g., "4774")
             
         Returns:
-            List of instructor dicts with reviews
+            List of instructor dicts (stats plus filtered review texts)
         """
         key = self._key(subject, catalog_number)
         course_data = self.data.get(key, {})
@@ -66,53 +188,64 @@ class TCFReviewsLoader:
         Returns:
             Dict with instructor stats and reviews, or None if not found
         """
-        instructors = self.get_course_instructors(subject, catalog_number)
-        
-        if not instructors:
-            return None
+        key = self._key(subject, catalog_number)
         
         # Normalize the search name
         search_name = self._normalize_name(instructor_name)
+        
+        # Try exact match first (single dict lookup)
+        inst = self._by_name.get((key, search_name))
+        if inst is not None:
+            return self._format_result(inst, limit)
+        
+        # Try matching by last name if first + last provided
         search_parts = search_name.split()
+        if len(search_parts) < 2:
+            return None
         
-        for inst in instructors:
-            tcf_name = self._normalize_name(inst.get("instructor_name", ""))
-            
-            # Try exact match first
-            if tcf_name == search_name:
+        search_first = search_parts[0]
+        # Prefix matches share a first initial, so only that bucket is scanned
+        for inst in self._index.get((key, search_parts[-1], search_first[:1]), ()):
+            # Also check first name initial or first name
+            tcf_first = inst["_norm_parts"][0]
+            if tcf_first.startswith(search_first) or search_first.startswith(tcf_first):
                 return self._format_result(inst, limit)
-            
-            # Try matching by last name if first + last provided
-            if len(search_parts) >= 2:
-                search_last = search_parts[-1]
-                tcf_parts = tcf_name.split()
-                if tcf_parts and tcf_parts[-1] == search_last:
-                    # Also check first name initial or first name
-                    search_first = search_parts[0]
-                    tcf_first = tcf_parts[0] if tcf_parts else ""
-                    if tcf_first.startswith(search_first) or search_first.startswith(tcf_first):
-                        return self._format_result(inst, limit)
+        
+        # Last resort: fuzzy match within this course (typos, honorifics, hyphens)
+        inst = self._fuzzy_match(key, search_name)
+        if inst is not None:
+            return self._format_result(inst, limit)
         
         return None
     
-    def _format_result(self, inst: dict, limit: int) -> dict:
-        """Format instructor data for output."""
-        reviews = inst.get("reviews", [])
+    def _fuzzy_match(self, key: str, search_name: str) -> Optional[dict]:
+        """Find the closest instructor name in a course with rapidfuzz, if installed."""
+        if process is None:
+            return None
         
-        # Filter out spam/test reviews
-        valid_reviews = []
-        for r in reviews:
-            text = r.get("text", "")
-            if len(text) > 50 and "app app app" not in text.lower():
-                valid_reviews.append(text)
+        instructors = self.data.get(key, {}).get("instructors", [])
+        if not instructors:
+            return None
         
+        match = process.extractOne(
+            search_name,
+            [inst["_norm_name"] for inst in instructors],
+            scorer=fuzz.token_sort_ratio,
+            score_cutoff=self.FUZZY_SCORE_CUTOFF,
+        )
+        if match is None:
+            return None
+        return instructors[match[2]]
+    
+    def _format_result(self, inst: dict, limit: int) -> dict:
+        """Format instructor data for output."""
         return {
             "instructor_name": inst.get("instructor_name", ""),
             "rating": inst.get("rating"),
             "difficulty": inst.get("difficulty"),
             "gpa": inst.get("gpa"),
-            "review_count": inst.get("review_count", len(reviews)),
-            "sample_reviews": valid_reviews[:limit],
+            "review_count": inst["review_count"],
+            "sample_reviews": inst["_valid_reviews"][:limit],
         }
     
     def summarize_instructor(self, subject: str, catalog_number: str, instructor_name: str) -> Optional[dict]:
@@ -141,13 +274,7 @@ class TCFReviewsLoader:
 
 
 # Singleton pattern for efficiency
-_tcf_loader: Optional[TCFReviewsLoader] = None
-
-
+@lru_cache
 def get_tcf_loader() -> TCFReviewsLoader:
     """Get the singleton TCF reviews loader."""
-    global _tcf_loader
-    if _tcf_loader is None:
-        _tcf_loader = TCFReviewsLoader()
-    return _tcf_loader
-
+    return TCFReviewsLoader()
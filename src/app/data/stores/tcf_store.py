@@ -2,7 +2,7 @@
 
 import json
 import os
-from typing import List
+from typing import List, Optional
 
 
 class TCFStore:
@@ -37,6 +37,9 @@ class TCFStore:
     def load(self, subject: str, catalog_number: str) -> List[dict]:
         return self.data.get(self._key(subject, catalog_number), [])
     
+    def get(self, subject: str, catalog_number: str) -> Optional[List[dict]]:
+        return self.data.get(self._key(subject, catalog_number))
+    
     def clear(self) -> None:
         self.data = {}
         self._save()
@@ -1,8 +1,13 @@
 """ChromaDB vector store for semantic search."""
 
 import re
+import queue
 import logging
+import threading
+import time
 import chromadb
+from concurrent.futures import Future
+from cachetools import LRUCache
 from chromadb.config import Settings as ChromaSettings
 from typing import Optional
 from pathlib import Path
@@ -32,6 +37,40 @@ class VectorStore:
         )
         
         self.gemini_service = GeminiService()
+        
+        # Query text -> embedding, so a query embedded once (e.g. for the
+        # semantic response cache) isn't embedded again for the search
+        self._query_embeddings: LRUCache = LRUCache(maxsize=1024)
+        self._query_embeddings_lock = threading.Lock()
+    
+    def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """Get search embeddings for queries, reusing recently computed ones.
+        
+        Queries not seen recently are embedded together in one request.
+        
+        Args:
+            queries: Query texts
+            
+        Returns:
+            Embedding vectors, in the same order as queries
+        """
+        with self._query_embeddings_lock:
+            embeddings = [self._query_embeddings.get(query) for query in queries]
+        
+        missing = list(dict.fromkeys(q for q, e in zip(queries, embeddings) if e is None))
+        if missing:
+            if len(missing) == 1:
+                new_embeddings = [self.gemini_service.get_query_embedding(missing[0])]
+            else:
+                new_embeddings = self.gemini_service.get_embeddings_batch(
+                    missing, task_type="retrieval_query"
+                )
+            computed = dict(zip(missing, new_embeddings))
+            with self._query_embeddings_lock:
+                self._query_embeddings.update(computed)
+            embeddings = [computed[q] if e is None else e for q, e in zip(queries, embeddings)]
+        
+        return embeddings
     
     def add_documents(
         self,
@@ -86,21 +125,14 @@ class VectorStore:
                 return match.group(1)
         return None
     
-    def search(
-        self,
-        query: str,
-        n_results: int = 5,
-    ) -> dict:
-        """Search for similar documents with hybrid approach.
-        
-        First checks for specific course number matches, then uses semantic search.
+    def _exact_matches(self, query: str) -> tuple[list, list, list]:
+        """Get documents whose catalog number is mentioned in the query.
         
         Args:
             query: Search query
-            n_results: Number of results to return
             
         Returns:
-            Dictionary with documents, metadatas, and distances
+            Tuple of (documents, metadatas, distances), all with distance 0
         """
         documents = []
         metadatas = []
@@ -127,34 +159,79 @@ class VectorStore:
             except Exception:
                 pass  # If metadata search fails, fall back to semantic
         
+        return documents, metadatas, distances
+    
+    def search(
+        self,
+        query: str,
+        n_results: int = 5,
+    ) -> dict:
+        """Search for similar documents with hybrid approach.
+        
+        First checks for specific course number matches, then uses semantic search.
+        
+        Args:
+            query: Search query
+            n_results: Number of results to return
+            
+        Returns:
+            Dictionary with documents, metadatas, and distances
+        """
+        return self.batch_search([query], n_results)[0]
+    
+    def batch_search(
+        self,
+        queries: list[str],
+        n_results: int = 5,
+    ) -> list[dict]:
+        """Run the hybrid search for several queries at once.
+        
+        Queries that still need semantic results are embedded in one request
+        and sent to Chroma as a single multi-query call.
+        
+        Args:
+            queries: Search queries
+            n_results: Number of results to return per query
+            
+        Returns:
+            One result dictionary per query, in the same order as queries
+        """
+        results = [self._exact_matches(query) for query in queries]
+        
         # Fill remaining slots with semantic search
-        remaining = n_results - len(documents)
-        if remaining > 0:
-            query_embedding = self.gemini_service.get_query_embedding(query)
+        pending = [i for i, (documents, _, _) in enumerate(results) if len(documents) < n_results]
+        if pending:
+            query_embeddings = self.embed_queries([queries[i] for i in pending])
             
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=remaining + len(documents),  # Get extra to account for duplicates
+            semantic = self.collection.query(
+                query_embeddings=query_embeddings,
+                n_results=n_results,  # Get extra to account for duplicates
                 include=["documents", "metadatas", "distances"],
             )
             
             # Add semantic results (avoiding duplicates)
-            if results["documents"] and results["documents"][0]:
+            for row, i in enumerate(pending):
+                documents, metadatas, distances = results[i]
+                if not semantic["documents"] or not semantic["documents"][row]:
+                    continue
                 for doc, meta, dist in zip(
-                    results["documents"][0], 
-                    results["metadatas"][0], 
-                    results["distances"][0]
+                    semantic["documents"][row],
+                    semantic["metadatas"][row],
+                    semantic["distances"][row]
                 ):
                     if doc not in documents and len(documents) < n_results:
                         documents.append(doc)
                         metadatas.append(meta)
                         distances.append(dist)
         
-        return {
-            "documents": documents,
-            "metadatas": metadatas,
-            "distances": distances,
-        }
+        return [
+            {
+                "documents": documents,
+                "metadatas": metadatas,
+                "distances": distances,
+            }
+            for documents, metadatas, distances in results
+        ]
     
     def clear(self) -> None:
         """Clear all documents from the collection."""
@@ -168,3 +245,62 @@ class VectorStore:
         """Get the number of documents in the collection."""
         return self.collection.count()
 
+
+
+
+class BatchingSearcher:
+    """Coalesces concurrent searches into batched VectorStore.batch_search calls.
+    
+    Each caller blocks until its result is ready. A background thread collects
+    requests for up to MAX_WAIT seconds (or MAX_BATCH requests) and dispatches
+    them together, so simultaneous users share one embedding request and one
+    Chroma query instead of paying for each separately.
+    """
+    
+    MAX_BATCH = 16
+    MAX_WAIT = 0.005  # seconds
+    
+    def __init__(self, vector_store: VectorStore, max_batch: int = MAX_BATCH, max_wait: float = MAX_WAIT):
+        self.vector_store = vector_store
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: queue.Queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="vector-search-batcher", daemon=True)
+        self._worker.start()
+    
+    def search(self, query: str, n_results: int = 5) -> dict:
+        """Search via the next batch (same result shape as VectorStore.search)."""
+        future: Future = Future()
+        self._queue.put((query, n_results, future))
+        return future.result()
+    
+    def _run(self) -> None:
+        """Worker loop: gather a batch, then dispatch it."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._dispatch(batch)
+    
+    def _dispatch(self, batch: list[tuple[str, int, Future]]) -> None:
+        """Run one batch_search per distinct n_results and resolve the futures."""
+        by_n_results: dict[int, list[tuple[str, int, Future]]] = {}
+        for item in batch:
+            by_n_results.setdefault(item[1], []).append(item)
+        
+        for n_results, items in by_n_results.items():
+            try:
+                results = self.vector_store.batch_search([query for query, _, _ in items], n_results)
+            except Exception as e:
+                for _, _, future in items:
+                    future.set_exception(e)
+                continue
+            for (_, _, future), result in zip(items, results):
+                future.set_result(result)
@@ -1,51 +1,23 @@
 """Main FastAPI application entry point."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from pathlib import Path
+from starlette.concurrency import run_in_threadpool
 
 from app.services import RAGEngine
 from app.config import get_settings
+from app.templating import get_templates, prewarm_templates
 from app.routers import chat_router, courses_router, schedule_router
+from app.routers.courses import sis_api, warm_courses_cache
 from app.data.indexer import CourseIndexer
 
 
 settings = get_settings()
 
 
-def format_sis_time(time_str: str) -> str:
-    """Format SIS time string to readable format.
-    
-    Converts "09.00.00.000000" to "9:00 AM", "14.30.00.000000" to "2:30 PM"
-    
-    Args:
-        time_str: Time string in format "HH.MM.SS.ffffff"
-        
-    Returns:
-        Formatted time string like "9:00 AM" or "2:30 PM"
-    """
-    if not time_str:
-        return ""
-    
-    try:
-        parts = time_str.split(".")
-        hour = int(parts[0])
-        minute = int(parts[1]) if len(parts) > 1 else 0
-        
-        period = "AM" if hour < 12 else "PM"
-        if hour == 0:
-            hour = 12
-        elif hour > 12:
-            hour -= 12
-        
-        return f"{hour}:{minute:02d} {period}"
-    except (ValueError, IndexError):
-        return time_str
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
@@ -60,9 +32,27 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"Could not check index status: {e}")
     
+    # Compile page templates up front so the first request doesn't pay for it
+    try:
+        prewarm_templates()
+    except Exception as e:
+        print(f"Could not prewarm templates: {e}")
+    
+    # Shared RAG engine for all chat requests (built once, not per request)
+    try:
+        app.state.rag_engine = RAGEngine()
+    except Exception as e:
+        print(f"Could not initialize RAG engine: {e}")
+    
+    # Warm the course browser in the background; startup doesn't wait on SIS
+    warm_task = asyncio.create_task(warm_courses_cache())
+    
     yield
     
     # Shutdown
+    warm_task.cancel()
+    await sis_api.aclose()
+    sis_api.close()
     print("Shutting down...")
 
 
@@ -75,16 +65,12 @@ app = FastAPI(
 )
 
 # Mount static files
-static_path = Path(__file__).parent.parent / "static"
+static_path = settings.static_dir
 static_path.mkdir(exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
 
-# Setup templates
-templates_path = Path(__file__).parent.parent / "templates"
-templates = Jinja2Templates(directory=str(templates_path))
-
-# Add custom filters to templates
-templates.env.filters["format_time"] = format_sis_time
+# Shared templates (filters are registered in app.templating)
+templates = get_templates()
 
 # Include routers
 app.include_router(chat_router)
@@ -121,7 +107,9 @@ async def run_indexing(request: Request):
     """Run course indexing from SIS API."""
     try:
         indexer = CourseIndexer()
-        count = indexer.index_courses(term="1262", force_refresh=False)
+        # Indexing is blocking (network, embeddings, Chroma writes); keep it
+        # off the event loop
+        count = await run_in_threadpool(indexer.index_courses, term="1262", force_refresh=False)
         
         return templates.TemplateResponse(
             "admin_index.html",
@@ -1,10 +1,20 @@
 """Pydantic models for data validation."""
 
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class Course(BaseModel):
+class FrozenModel(BaseModel):
+    """Base for the immutable schemas below.
+    
+    Instances cannot be mutated after validation, so they are safe to share
+    across requests.
+    """
+    
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+
+
+class Course(FrozenModel):
     """Course information model."""
     
     subject: str = Field(..., description="Subject code (e.g., CS)")
@@ -20,7 +30,7 @@ class Course(BaseModel):
         return f"{self.subject} {self.catalog_number}"
 
 
-class Section(BaseModel):
+class Section(FrozenModel):
     """Course section model."""
     
     class_number: str = Field(..., description="Section class number")
@@ -35,21 +45,21 @@ class Section(BaseModel):
     waitlist_total: Optional[int] = Field(None, description="Waitlist count")
 
 
-class ChatMessage(BaseModel):
+class ChatMessage(FrozenModel):
     """Single chat message."""
     
     role: str = Field(..., description="Message role: user or assistant")
     content: str = Field(..., description="Message content")
 
 
-class ChatRequest(BaseModel):
+class ChatRequest(FrozenModel):
     """Chat request from user."""
     
     message: str = Field(..., description="User's message")
     conversation_id: Optional[str] = Field(None, description="Conversation ID for context")
 
 
-class ChatResponse(BaseModel):
+class ChatResponse(FrozenModel):
     """Chat response from assistant."""
     
     response: str = Field(..., description="Assistant's response")
@@ -57,7 +67,7 @@ class ChatResponse(BaseModel):
     conversation_id: str = Field(..., description="Conversation ID")
 
 
-class CourseSearchRequest(BaseModel):
+class CourseSearchRequest(FrozenModel):
     """Course search parameters."""
     
     subject: Optional[str] = Field(None, description="Subject filter")
@@ -65,7 +75,7 @@ class CourseSearchRequest(BaseModel):
     term: str = Field(default="1262", description="Term code (e.g., 1262 for Spring 2025)")
 
 
-class ScheduleItem(BaseModel):
+class ScheduleItem(FrozenModel):
     """Item in user's schedule."""
     
     course_id: str = Field(..., description="Course identifier")
@@ -3,32 +3,39 @@
 import uuid
 import json
 import logging
-import mistune
-from fastapi import APIRouter, Request, Form
+from cachetools import TTLCache
+from fastapi import APIRouter, Request, Form, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
-from fastapi.templating import Jinja2Templates
-from app.config import get_settings
+from app.templating import get_templates, render_markdown
 from app.services.rag_engine import RAGEngine
 
 # Setup logging
 logger = logging.getLogger("uvicorn.error")
 
 router = APIRouter(prefix="/chat", tags=["chat"])
-settings = get_settings()
-templates = Jinja2Templates(directory=str(settings.templates_dir))
+templates = get_templates()
 
-# Markdown renderer - mistune is fast and handles edge cases well
-md = mistune.create_markdown(escape=False, plugins=['table', 'strikethrough'])
+# In-memory session storage (for demo purposes). Bounded, and idle sessions
+# expire after an hour so long-running servers don't grow without limit.
+chat_sessions: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
 
-def render_markdown(text: str) -> str:
-    """Convert markdown to HTML."""
-    return md(text)
 
-# Register markdown filter for templates
-templates.env.filters['markdown'] = render_markdown
+def get_session_messages(session_id: str) -> list[dict]:
+    """Get (or create) a session's message list and refresh its TTL."""
+    messages = chat_sessions.get(session_id)
+    if messages is None:
+        messages = []
+    # Re-insert so the TTL counts from the latest activity, not creation
+    chat_sessions[session_id] = messages
+    return messages
 
-# In-memory session storage (for demo purposes)
-chat_sessions: dict[str, list[dict]] = {}
+
+def get_rag_engine(request: Request) -> RAGEngine:
+    """Get the app-wide RAG engine created at startup (created lazily if missing)."""
+    rag_engine = getattr(request.app.state, "rag_engine", None)
+    if rag_engine is None:
+        rag_engine = request.app.state.rag_engine = RAGEngine()
+    return rag_engine
 
 
 @router.get("", response_class=HTMLResponse)
@@ -57,26 +64,25 @@ async def send_message(
     request: Request,
     message: str = Form(...),
     session_id: str = Form(...),
+    rag_engine: RAGEngine = Depends(get_rag_engine),
 ):
     """Process a chat message and return response directly (no redirect for speed)."""
     # Initialize session if needed
-    if session_id not in chat_sessions:
-        chat_sessions[session_id] = []
+    messages = get_session_messages(session_id)
     
     # Add user message
-    chat_sessions[session_id].append({
+    messages.append({
         "role": "user",
         "content": message,
     })
     
     try:
-        logger.info(f"[CHAT] Received message: {message}")
+        logger.info("[CHAT] Received message: %s", message)
         
         # Get RAG response with session memory
-        rag_engine = RAGEngine()
         logger.info("[CHAT] Calling RAG query...")
-        result = rag_engine.query(message, session_id=session_id)
-        logger.info(f"[CHAT] Got result with {result.get('context_used', 0)} context docs")
+        result = await rag_engine.aquery(message, session_id=session_id)
+        logger.info("[CHAT] Got result with %d context docs", result.get("context_used", 0))
         
         response_text = result["response"]
         
@@ -87,13 +93,12 @@ async def send_message(
         response_text = f"I apologize, but I encountered an error processing your request. Please try again. (Error: {str(e)})"
     
     # Add assistant response
-    chat_sessions[session_id].append({
+    messages.append({
         "role": "assistant",
         "content": response_text,
     })
     
     # Return rendered page directly (faster than redirect)
-    messages = chat_sessions.get(session_id, [])
     return templates.TemplateResponse(
         "chat.html",
         {
@@ -106,14 +111,15 @@ async def send_message(
 
 
 @router.post("/clear", response_class=HTMLResponse)
-async def clear_chat(session_id: str = Form(...)):
+async def clear_chat(
+    session_id: str = Form(...),
+    rag_engine: RAGEngine = Depends(get_rag_engine),
+):
     """Clear chat history for a session."""
     # Clear local message storage
-    if session_id in chat_sessions:
-        del chat_sessions[session_id]
+    chat_sessions.pop(session_id, None)
     
     # Clear Gemini conversation memory
-    rag_engine = RAGEngine()
     rag_engine.clear_session(session_id)
     
     return RedirectResponse(
@@ -126,57 +132,64 @@ async def clear_chat(session_id: str = Form(...)):
 async def api_send_message(
     message: str = Form(...),
     session_id: str = Form(...),
+    rag_engine: RAGEngine = Depends(get_rag_engine),
 ):
     """Simple JSON API for chat - returns response as HTML (markdown rendered)."""
-    if session_id not in chat_sessions:
-        chat_sessions[session_id] = []
+    messages = get_session_messages(session_id)
     
-    chat_sessions[session_id].append({"role": "user", "content": message})
+    messages.append({"role": "user", "content": message})
     
     try:
-        rag_engine = RAGEngine()
-        result = rag_engine.query(message, session_id=session_id)
+        result = await rag_engine.aquery(message, session_id=session_id)
         response_text = result["response"]
     except Exception as e:
         response_text = f"Error: {str(e)}"
     
-    chat_sessions[session_id].append({"role": "assistant", "content": response_text})
+    messages.append({"role": "assistant", "content": response_text})
     
     # Return markdown-rendered HTML
     return {"response": render_markdown(response_text)}
 
 
 @router.get("/stream")
-async def stream_response(message: str, session_id: str):
+async def stream_response(
+    message: str,
+    session_id: str,
+    rag_engine: RAGEngine = Depends(get_rag_engine),
+):
     """Stream a chat response using Server-Sent Events (SSE).
     
     This endpoint returns a stream of text chunks as they are generated,
     allowing for real-time display of the AI response.
     """
-    def generate():
+    async def generate():
+        # Flush headers and a comment line right away so the client and any
+        # proxy see the stream open while retrieval is still running
+        yield ": stream-open\n\n"
+        
         try:
             # Add user message to session
-            if session_id not in chat_sessions:
-                chat_sessions[session_id] = []
+            messages = get_session_messages(session_id)
             
-            chat_sessions[session_id].append({
+            messages.append({
                 "role": "user",
                 "content": message,
             })
             
             # Stream RAG response
-            rag_engine = RAGEngine()
-            full_response = ""
+            response_parts = []
             
-            for chunk in rag_engine.query_stream(message):
-                full_response += chunk
+            # Retrieval runs in a worker thread and generation is async; the
+            # event loop stays free to flush each chunk as soon as it's yielded
+            async for chunk in rag_engine.aquery_stream(message, session_id=session_id):
+                response_parts.append(chunk)
                 # SSE format: data: <content>\n\n
                 yield f"data: {json.dumps({'text': chunk})}\n\n"
             
             # Save complete response to session
-            chat_sessions[session_id].append({
+            messages.append({
                 "role": "assistant",
-                "content": full_response,
+                "content": "".join(response_parts),
             })
             
             # Signal completion
@@ -192,6 +205,8 @@ async def stream_response(message: str, session_id: str):
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
+            # Stop nginx-style proxies from buffering the event stream
+            "X-Accel-Buffering": "no",
         }
     )
 
@@ -1,52 +1,70 @@
 """Courses router for browsing and searching courses."""
 
+import asyncio
+from urllib.parse import urlencode
 from fastapi import APIRouter, Request, Form, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from app.config import get_settings
+from starlette.concurrency import run_in_threadpool
+from app.templating import get_templates
 from app.data.sources import SISApi
-from app.data.stores import SISStore
+from app.routers.schedule import user_schedules
 
 router = APIRouter(prefix="/courses", tags=["courses"])
-settings = get_settings()
-templates = Jinja2Templates(directory=str(settings.templates_dir))
+templates = get_templates()
+
+# Shared SIS client so live searches reuse pooled connections
+sis_api = SISApi()
 
 # Cache store for faster searching
-sis_store = SISStore()
+sis_store = sis_api.store
 
+# Subject dropdown options (constant; shared by every render)
+COMMON_SUBJECTS: tuple[dict, ...] = (
+    {"code": "CS", "name": "Computer Science"},
+    {"code": "DS", "name": "Data Science"},
+    {"code": "MATH", "name": "Mathematics"},
+    {"code": "STAT", "name": "Statistics"},
+    {"code": "STS", "name": "Science, Technology & Society"},
+    {"code": "ENGR", "name": "Engineering"},
+    {"code": "APMA", "name": "Applied Mathematics"},
+    {"code": "ECE", "name": "Electrical & Computer Engineering"},
+    {"code": "PHYS", "name": "Physics"},
+    {"code": "ECON", "name": "Economics"},
+)
 
-def get_user_schedule(user_id: str) -> list[dict]:
-    """Get user's schedule (lazy import to avoid circular dependency)."""
-    from app.routers.schedule import user_schedules
-    return user_schedules.get(user_id, [])
 
+# Terms prefetched at startup so the first /courses request is already warm
+WARM_TERMS = ("1262",)
 
-def format_sis_time(time_str: str) -> str:
-    """Format SIS time string to readable format.
+
+async def warm_courses_cache(terms: tuple[str, ...] = WARM_TERMS, concurrency: int = 8) -> None:
+    """Preload course data for the common subjects.
     
-    Converts "09.00.00.000000" to "9:00 AM", "14.30.00.000000" to "2:30 PM"
+    Terms with a full cache file are parsed into memory; otherwise page 1 of
+    each common subject is fetched concurrently into the SIS search cache.
     """
-    if not time_str:
-        return ""
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def fetch(subject: str, term: str) -> None:
+        async with semaphore:
+            await run_in_threadpool(sis_api.search, subject=subject, term=term, page=1)
+    
+    tasks = []
+    for term in terms:
+        if sis_store.has(term):
+            tasks.append(run_in_threadpool(sis_store.load, term))
+        else:
+            tasks.extend(fetch(subj["code"], term) for subj in COMMON_SUBJECTS)
     
-    try:
-        parts = time_str.split(".")
-        hour = int(parts[0])
-        minute = int(parts[1]) if len(parts) > 1 else 0
-        
-        period = "AM" if hour < 12 else "PM"
-        if hour == 0:
-            hour = 12
-        elif hour > 12:
-            hour -= 12
-        
-        return f"{hour}:{minute:02d} {period}"
-    except (ValueError, IndexError):
-        return time_str
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    failed = sum(isinstance(r, BaseException) for r in results)
+    if failed:
+        print(f"[COURSES] Cache warm-up: {failed}/{len(results)} loads failed")
 
 
-# Add custom filter to templates
-templates.env.filters["format_time"] = format_sis_time
+def get_user_schedule(user_id: str) -> list[dict]:
+    """Get user's schedule."""
+    return user_schedules.get(user_id, [])
 
 
 @router.get("", response_class=HTMLResponse)
@@ -105,8 +123,9 @@ async def courses_page(
             else:
                 # Fall back to API search (requires at least subject or keyword)
                 if subject or keyword:
-                    sis_api = SISApi()
-                    response = sis_api.search(
+                    # Run the blocking HTTP call off the event loop
+                    response = await run_in_threadpool(
+                        sis_api.search,
                         subject=subject if subject else None,
                         keyword=keyword if keyword else None,
                         term=term,
@@ -130,7 +149,7 @@ async def courses_page(
             "total_count": total_count,
             "error_message": error_message,
             "title": "Courses - HoosAdvisor",
-            "subjects": get_common_subjects(),
+            "subjects": COMMON_SUBJECTS,
             "scheduled_keys": scheduled_keys,
             "from_cache": from_cache,
             "user_id": user_id,
@@ -146,34 +165,18 @@ async def search_courses(
     searched: str = Form(default=""),
 ):
     """Handle course search form submission."""
-    params = ["searched=true"]  # Always mark as searched
+    params = {"searched": "true"}  # Always mark as searched
     if subject:
-        params.append(f"subject={subject}")
+        params["subject"] = subject
     if keyword:
-        params.append(f"keyword={keyword}")
+        params["keyword"] = keyword
     if term:
-        params.append(f"term={term}")
+        params["term"] = term
     
-    query_string = "&".join(params)
+    # urlencode escapes spaces/&/# in free-text keywords
+    query_string = urlencode(params)
     
     return RedirectResponse(
         url=f"/courses?{query_string}",
         status_code=303,
     )
-
-
-def get_common_subjects() -> list[dict]:
-    """Get list of common subject codes."""
-    return [
-        {"code": "CS", "name": "Computer Science"},
-        {"code": "DS", "name": "Data Science"},
-        {"code": "MATH", "name": "Mathematics"},
-        {"code": "STAT", "name": "Statistics"},
-        {"code": "STS", "name": "Science, Technology & Society"},
-        {"code": "ENGR", "name": "Engineering"},
-        {"code": "APMA", "name": "Applied Mathematics"},
-        {"code": "ECE", "name": "Electrical & Computer Engineering"},
-        {"code": "PHYS", "name": "Physics"},
-        {"code": "ECON", "name": "Economics"},
-    ]
-
@@ -2,43 +2,23 @@
 
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from app.config import get_settings
+from app.templating import get_templates
 
 router = APIRouter(prefix="/schedule", tags=["schedule"])
-settings = get_settings()
-templates = Jinja2Templates(directory=str(settings.templates_dir))
+templates = get_templates()
 
 
-def format_sis_time(time_str: str) -> str:
-    """Format SIS time string to readable format.
-    
-    Converts "09.00.00.000000" to "9:00 AM", "14.30.00.000000" to "2:30 PM"
-    """
-    if not time_str:
-        return ""
-    
-    try:
-        parts = time_str.split(".")
-        hour = int(parts[0])
-        minute = int(parts[1]) if len(parts) > 1 else 0
-        
-        period = "AM" if hour < 12 else "PM"
-        if hour == 0:
-            hour = 12
-        elif hour > 12:
-            hour -= 12
-        
-        return f"{hour}:{minute:02d} {period}"
-    except (ValueError, IndexError):
-        return time_str
+# In-memory schedule storage (for demo purposes)
+user_schedules: dict[str, list[dict]] = {}
 
+# Bumped on every change to a user's schedule so readers can cache
+# anything derived from it (e.g. the chat prompt's schedule context)
+user_schedule_versions: dict[str, int] = {}
 
-# Add custom filter to templates
-templates.env.filters["format_time"] = format_sis_time
 
-# In-memory schedule storage (for demo purposes)
-user_schedules: dict[str, list[dict]] = {}
+def bump_schedule_version(user_id: str) -> None:
+    """Mark a user's schedule as changed."""
+    user_schedule_versions[user_id] = user_schedule_versions.get(user_id, 0) + 1
 
 
 @router.get("", response_class=HTMLResponse)
@@ -94,6 +74,7 @@ async def add_to_schedule(
     
     # Add to schedule
     user_schedules[user_id].append(new_item)
+    bump_schedule_version(user_id)
     
     return RedirectResponse(
         url=f"/schedule?user_id={user_id}",
@@ -113,6 +94,7 @@ async def remove_from_schedule(
             item for item in user_schedules[user_id]
             if not (item["course_id"] == course_id and item["section_id"] == section_id)
         ]
+        bump_schedule_version(user_id)
     
     return RedirectResponse(
         url=f"/schedule?user_id={user_id}",
@@ -125,6 +107,7 @@ async def clear_schedule(user_id: str = Form(default="default")):
     """Clear entire schedule."""
     if user_id in user_schedules:
         user_schedules[user_id] = []
+        bump_schedule_version(user_id)
     
     return RedirectResponse(
         url=f"/schedule?user_id={user_id}",
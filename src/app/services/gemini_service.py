@@ -1,16 +1,54 @@
 """Google Gemini API service wrapper."""
 
+import asyncio
+import datetime
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from app.config import get_settings
 
+# Same logger as the routers, so uvicorn's --log-level applies
+logger = logging.getLogger("uvicorn.error")
+
 # Module-level chat session storage (persists across GeminiService instances)
 _chat_sessions: dict[str, "genai.ChatSession"] = {}
 
+# Sessions whose model reads the system prompt from a Gemini context cache
+_cached_chat_ids: set[str] = set()
+
+# (model, system prompt) hash -> (refresh-after time, model bound to the
+# context cache, or None if caching failed and prompts are sent inline)
+_cached_models: dict[str, tuple[float, Optional["genai.GenerativeModel"]]] = {}
+# Held while checking/creating a context cache, so concurrent requests at a
+# refresh boundary create (and pay for) one, not one each
+_cached_models_lock = threading.Lock()
+
+# Errors from a chat whose context cache has expired or been deleted (Gemini
+# reports a missing cache as 403/404/400); anything else (rate limits,
+# network errors) is re-raised rather than retried inline
+_CACHE_GONE_ERRORS = (
+    google_exceptions.NotFound,
+    google_exceptions.FailedPrecondition,
+    google_exceptions.PermissionDenied,
+)
+
 
 class GeminiService:
     """Service for interacting with Google Gemini API."""
     
+    # Max texts per batch embedding request (API limit is 100)
+    EMBED_BATCH_SIZE = 100
+    
+    # Lifetime of a system-prompt context cache; it's recreated a few minutes
+    # before it expires
+    CONTEXT_CACHE_TTL = 3600
+    CONTEXT_CACHE_REFRESH_MARGIN = 300
+    
     def __init__(self):
         settings = get_settings()
         genai.configure(api_key=settings.gemini_api_key)
@@ -18,6 +56,59 @@ class GeminiService:
         self.embedding_model = settings.gemini_embedding_model
         self.model = genai.GenerativeModel(self.model_name)
     
+    def _get_model(self, system_prompt: Optional[str]) -> tuple["genai.GenerativeModel", bool]:
+        """Get the model to call, with the system prompt in a context cache if possible.
+        
+        The static system prompt is uploaded once as Gemini cached content, so
+        requests don't resend (and re-bill) it. If caching is unavailable (e.g.
+        the prompt is below the model's minimum cache size), the plain model is
+        returned and the caller sends the prompt inline.
+        
+        Args:
+            system_prompt: Optional system instructions
+            
+        Returns:
+            Tuple of (model, whether the system prompt is already in the model's context)
+        """
+        if not system_prompt:
+            return self.model, False
+        
+        key = self._cache_key(system_prompt)
+        with _cached_models_lock:
+            now = time.time()
+            entry = _cached_models.get(key)
+            if entry is None or now >= entry[0]:
+                model = None
+                try:
+                    cached = genai.caching.CachedContent.create(
+                        model=self.model_name,
+                        system_instruction=system_prompt,
+                        ttl=datetime.timedelta(seconds=self.CONTEXT_CACHE_TTL),
+                    )
+                    model = genai.GenerativeModel.from_cached_content(cached_content=cached)
+                except Exception as e:
+                    logger.warning("[GEMINI] Context caching unavailable, sending system prompt inline: %s", e)
+                entry = (now + self.CONTEXT_CACHE_TTL - self.CONTEXT_CACHE_REFRESH_MARGIN, model)
+                _cached_models[key] = entry
+        
+        if entry[1] is None:
+            return self.model, False
+        return entry[1], True
+    
+    def _cache_key(self, system_prompt: str) -> str:
+        """Key of a (model, system prompt) pair in _cached_models."""
+        return hashlib.sha256(f"{self.model_name}\0{system_prompt}".encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _system_history(system_prompt: Optional[str]) -> list[dict]:
+        """Chat history that carries the system prompt inline."""
+        if not system_prompt:
+            return []
+        return [
+            {"role": "user", "parts": [f"[SYSTEM INSTRUCTIONS - Follow these for all responses]\n{system_prompt}"]},
+            {"role": "model", "parts": ["Understood. I will follow these instructions for our conversation."]}
+        ]
+    
     def get_completion(
         self,
         prompt: str,
@@ -36,9 +127,10 @@ class GeminiService:
         Returns:
             The assistant's response text
         """
-        # Combine system prompt and user prompt
+        # Combine system prompt and user prompt (unless it's in the context cache)
+        model, prompt_cached = self._get_model(system_prompt)
         full_prompt = prompt
-        if system_prompt:
+        if system_prompt and not prompt_cached:
             full_prompt = f"{system_prompt}\n\n{prompt}"
         
         generation_config = genai.GenerationConfig(
@@ -46,7 +138,7 @@ class GeminiService:
             max_output_tokens=max_tokens,
         )
         
-        response = self.model.generate_content(
+        response = model.generate_content(
             full_prompt,
             generation_config=generation_config,
         )
@@ -71,9 +163,10 @@ class GeminiService:
         Yields:
             Text chunks as they are generated
         """
-        # Combine system prompt and user prompt
+        # Combine system prompt and user prompt (unless it's in the context cache)
+        model, prompt_cached = self._get_model(system_prompt)
         full_prompt = prompt
-        if system_prompt:
+        if system_prompt and not prompt_cached:
             full_prompt = f"{system_prompt}\n\n{prompt}"
         
         generation_config = genai.GenerationConfig(
@@ -81,7 +174,7 @@ class GeminiService:
             max_output_tokens=max_tokens,
         )
         
-        response = self.model.generate_content(
+        response = model.generate_content(
             full_prompt,
             generation_config=generation_config,
             stream=True,
@@ -111,31 +204,207 @@ class GeminiService:
         Returns:
             The assistant's response text
         """
-        # Get or create chat session (using module-level storage)
+        chat = self._get_chat(session_id, system_prompt)
+        self._log_chat_prompt(prompt)
+        
+        generation_config = genai.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens,
+        )
+        
+        try:
+            response = chat.send_message(prompt, generation_config=generation_config)
+        except _CACHE_GONE_ERRORS:
+            if session_id not in _cached_chat_ids:
+                raise
+            chat = self._rebuild_chat_inline(session_id, chat, system_prompt)
+            response = chat.send_message(prompt, generation_config=generation_config)
+        return response.text
+    
+    def _get_chat(self, session_id: str, system_prompt: Optional[str]) -> "genai.ChatSession":
+        """Get or create a chat session (using module-level storage)."""
         if session_id not in _chat_sessions:
-            # Create new chat with system prompt in history
-            history = []
-            if system_prompt:
-                history = [
-                    {"role": "user", "parts": [f"[SYSTEM INSTRUCTIONS - Follow these for all responses]\n{system_prompt}"]},
-                    {"role": "model", "parts": ["Understood. I will follow these instructions for our conversation."]}
-                ]
-            _chat_sessions[session_id] = self.model.start_chat(history=history)
-        
-        chat = _chat_sessions[session_id]
-        
-        print("=" * 80)
-        print("[GEMINI CHAT PROMPT]")
-        print("=" * 80)
-        print(prompt)
-        print("=" * 80)
+            # Create new chat; the system prompt comes from the context cache
+            # when available, otherwise it's placed in the history
+            model, prompt_cached = self._get_model(system_prompt)
+            if prompt_cached:
+                _cached_chat_ids.add(session_id)
+                history = []
+            else:
+                history = self._system_history(system_prompt)
+            _chat_sessions[session_id] = model.start_chat(history=history)
+        
+        return _chat_sessions[session_id]
+    
+    def has_chat_history(self, session_id: str) -> bool:
+        """Whether a session has sent any messages to the model yet."""
+        # Chats are only created when their first message is sent
+        return session_id in _chat_sessions
+    
+    def add_chat_turn(
+        self,
+        session_id: str,
+        prompt: str,
+        response: str,
+        system_prompt: Optional[str] = None,
+    ) -> None:
+        """Record an exchange answered without the model (e.g. from a cache).
+        
+        Later messages in the session can then refer back to it, as if the
+        model had produced the response itself.
+        
+        Args:
+            session_id: Unique session ID for conversation tracking
+            prompt: The user's prompt, as it would have been sent
+            response: The assistant's response text
+            system_prompt: Optional system instructions (only used for new sessions)
+        """
+        chat = self._get_chat(session_id, system_prompt)
+        chat.history = list(chat.history) + [
+            {"role": "user", "parts": [prompt]},
+            {"role": "model", "parts": [response]},
+        ]
+    
+    def _rebuild_chat_inline(
+        self,
+        session_id: str,
+        chat: "genai.ChatSession",
+        system_prompt: Optional[str],
+    ) -> "genai.ChatSession":
+        """Continue a session with the system prompt inline instead of cached.
+        
+        The context cache may have expired under a long-lived session, so the
+        conversation so far is carried over to a plain-model chat, and the
+        cache is recreated for the next new session.
+        """
+        _cached_chat_ids.discard(session_id)
+        if system_prompt:
+            with _cached_models_lock:
+                _cached_models.pop(self._cache_key(system_prompt), None)
+        chat = self.model.start_chat(
+            history=self._system_history(system_prompt) + list(chat.history)
+        )
+        _chat_sessions[session_id] = chat
+        return chat
+    
+    @staticmethod
+    def _log_chat_prompt(prompt: str) -> None:
+        """Log the outgoing chat prompt at DEBUG level (e.g. --log-level debug)."""
+        # Prompts carry the whole RAG context; skip building the message
+        # unless it will actually be emitted
+        if logger.isEnabledFor(logging.DEBUG):
+            rule = "=" * 80
+            logger.debug("%s\n[GEMINI CHAT PROMPT]\n%s\n%s\n%s", rule, rule, prompt, rule)
+    
+    async def aget_completion(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 999999,
+    ) -> str:
+        """Async version of get_completion (doesn't block the event loop).
+        
+        Args:
+            prompt: The user's prompt/question
+            system_prompt: Optional system instructions
+            temperature: Creativity level (0-1)
+            max_tokens: Maximum response length
+            
+        Returns:
+            The assistant's response text
+        """
+        # Context cache creation is a blocking call (at most once an hour)
+        model, prompt_cached = await asyncio.to_thread(self._get_model, system_prompt)
+        full_prompt = prompt
+        if system_prompt and not prompt_cached:
+            full_prompt = f"{system_prompt}\n\n{prompt}"
         
         generation_config = genai.GenerationConfig(
             temperature=temperature,
             max_output_tokens=max_tokens,
         )
         
-        response = chat.send_message(prompt, generation_config=generation_config)
+        response = await model.generate_content_async(
+            full_prompt,
+            generation_config=generation_config,
+        )
+        
+        return response.text
+    
+    async def aget_completion_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 999999,
+    ):
+        """Async version of get_completion_stream.
+        
+        Args:
+            prompt: The user's prompt/question
+            system_prompt: Optional system instructions
+            temperature: Creativity level (0-1)
+            max_tokens: Maximum response length
+            
+        Yields:
+            Text chunks as they are generated
+        """
+        model, prompt_cached = await asyncio.to_thread(self._get_model, system_prompt)
+        full_prompt = prompt
+        if system_prompt and not prompt_cached:
+            full_prompt = f"{system_prompt}\n\n{prompt}"
+        
+        generation_config = genai.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens,
+        )
+        
+        response = await model.generate_content_async(
+            full_prompt,
+            generation_config=generation_config,
+            stream=True,
+        )
+        
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+    
+    async def aget_chat_completion(
+        self,
+        prompt: str,
+        session_id: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 999999,
+    ) -> str:
+        """Async version of get_chat_completion.
+        
+        Args:
+            prompt: The user's prompt/question
+            session_id: Unique session ID for conversation tracking
+            system_prompt: Optional system instructions (only used for new sessions)
+            temperature: Creativity level (0-1)
+            max_tokens: Maximum response length
+            
+        Returns:
+            The assistant's response text
+        """
+        chat = await asyncio.to_thread(self._get_chat, session_id, system_prompt)
+        self._log_chat_prompt(prompt)
+        
+        generation_config = genai.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens,
+        )
+        
+        try:
+            response = await chat.send_message_async(prompt, generation_config=generation_config)
+        except _CACHE_GONE_ERRORS:
+            if session_id not in _cached_chat_ids:
+                raise
+            chat = self._rebuild_chat_inline(session_id, chat, system_prompt)
+            response = await chat.send_message_async(prompt, generation_config=generation_config)
         return response.text
     
     def clear_chat_session(self, session_id: str) -> bool:
@@ -147,6 +416,7 @@ class GeminiService:
         Returns:
             True if session was cleared, False if it didn't exist
         """
+        _cached_chat_ids.discard(session_id)
         if session_id in _chat_sessions:
             del _chat_sessions[session_id]
             return True
@@ -181,20 +451,46 @@ class GeminiService:
         """
         return self.get_embedding(text, task_type="retrieval_query")
     
-    def get_embeddings_batch(self, texts: list[str], task_type: str = "retrieval_document") -> list[list[float]]:
+    def get_embeddings_batch(
+        self,
+        texts: list[str],
+        task_type: str = "retrieval_document",
+        max_workers: int = 4,
+    ) -> list[list[float]]:
         """Get embedding vectors for multiple texts.
         
+        Texts are sent EMBED_BATCH_SIZE at a time in a single batch request
+        each, and multiple batches are dispatched concurrently.
+        
         Args:
             texts: List of texts to embed
             task_type: One of "retrieval_document" or "retrieval_query"
+            max_workers: Max batch requests in flight at once
             
         Returns:
-            List of embedding vectors
+            List of embedding vectors, in the same order as texts
         """
+        batches = [
+            texts[i:i + self.EMBED_BATCH_SIZE]
+            for i in range(0, len(texts), self.EMBED_BATCH_SIZE)
+        ]
+        
+        def embed_batch(batch: list[str]) -> list[list[float]]:
+            result = genai.embed_content(
+                model=self.embedding_model,
+                content=batch,
+                task_type=task_type,
+            )
+            return result['embedding']
+        
+        if len(batches) <= 1 or max_workers <= 1:
+            results = map(embed_batch, batches)
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+                results = list(executor.map(embed_batch, batches))
+        
         embeddings = []
-        for text in texts:
-            embedding = self.get_embedding(text, task_type=task_type)
-            embeddings.append(embedding)
+        for batch_embeddings in results:
+            embeddings.extend(batch_embeddings)
         
         return embeddings
-
@@ -1,20 +1,54 @@
 """RAG (Retrieval-Augmented Generation) engine."""
 
+import asyncio
+import logging
 import re
+import threading
+from functools import lru_cache
 from typing import Optional
+from cachetools import TTLCache
 from app.services.gemini_service import GeminiService
-from app.data.vector_store import VectorStore
-from app.config import get_cluster_summary
+from app.services.semantic_cache import SemanticCache
+from app.data.vector_store import BatchingSearcher, VectorStore
+from app.config import get_cluster_summary, get_settings
 
-# Module-level storage for RAG context (persists across RAGEngine instances)
-_last_context: dict[str, str] = {}
-_last_query: dict[str, str] = {}
+# Same logger as the routers, so uvicorn's --log-level applies
+logger = logging.getLogger("uvicorn.error")
+
+# Per-session context for follow-ups (persists across RAGEngine instances).
+# Idle sessions expire after SESSION_TTL; retrieved context is additionally
+# capped by total characters so long-running servers don't grow unbounded.
+SESSION_TTL = 1800  # seconds
+MAX_SESSIONS = 10_000
+MAX_CONTEXT_CHARS = 100_000_000
+_last_context: TTLCache = TTLCache(maxsize=MAX_CONTEXT_CHARS, ttl=SESSION_TTL, getsizeof=len)
+_last_query: TTLCache = TTLCache(maxsize=MAX_SESSIONS, ttl=SESSION_TTL)
+# Guards both caches: prompts are prepared in worker threads concurrently
+_session_lock = threading.Lock()
+
+
+# app.routers.schedule, resolved on first use (importing it at module load
+# would be circular: app.routers imports the chat router, which imports us)
+_schedule_router = None
+
+
+def _get_schedule_router():
+    """Import the schedule router once and keep a reference to it."""
+    global _schedule_router
+    if _schedule_router is None:
+        from app.routers import schedule
+        _schedule_router = schedule
+    return _schedule_router
 
 
 def get_user_schedule(user_id: str = "default") -> list[dict]:
-    """Get user's schedule (lazy import to avoid circular dependency)."""
-    from app.routers.schedule import user_schedules
-    return user_schedules.get(user_id, [])
+    """Get user's schedule."""
+    return _get_schedule_router().user_schedules.get(user_id, [])
+
+
+def get_schedule_version(user_id: str = "default") -> int:
+    """Get the change counter for a user's schedule (0 if never modified)."""
+    return _get_schedule_router().user_schedule_versions.get(user_id, 0)
 
 
 class RAGEngine:
@@ -90,58 +124,131 @@ When discussing general course information (e.g. "What are some good courses to
 
 {cluster_info}
 """
+    # SYSTEM_PROMPT_BASE with cluster info filled in (set on first __init__)
+    SYSTEM_PROMPT: Optional[str] = None
     
     # Follow-up phrases that should reuse previous context
-    FOLLOWUP_PHRASES = [
+    FOLLOWUP_PHRASES = (
         "keep going", "continue", "more info", "tell me more", "more", "elaborate",
         "go on", "yes", "yes please", "sure", "ok", "okay", "yeah", "yep",
         "what else", "anything else", "more details", "explain more",
         "and?", "so?", "then?", "more about", "keep talking",
-    ]
+    )
+    # Exact follow-ups (the usual case) are a single hash lookup
+    FOLLOWUP_SET = frozenset(FOLLOWUP_PHRASES)
     
     def __init__(self):
         self.gemini_service = GeminiService()
         self.vector_store = VectorStore()
+        # Concurrent requests share embedding + Chroma calls
+        self._batcher = BatchingSearcher(self.vector_store)
         self.conversation_history: dict[str, list[dict]] = {}
-        # Build the full system prompt with cluster info
-        self.SYSTEM_PROMPT = self.SYSTEM_PROMPT_BASE.format(
-            cluster_info=get_cluster_summary()
-        )
+        # (normalized question, n_results) -> (context, sources, docs used);
+        # repeat questions skip the query embedding and vector search
+        self._context_cache: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+        self._context_lock = threading.Lock()
+        self._context_hits = 0
+        self._context_misses = 0
+        # Stateless answers, reused for reworded versions of a question
+        self._semantic_cache = SemanticCache(maxsize=500, threshold=0.97)
+        # user_id -> (schedule version, formatted schedule context)
+        self._schedule_cache: dict[str, tuple[int, str]] = {}
+        # Character budget for retrieved context (bounds prompt tokens)
+        settings = get_settings()
+        self.max_doc_chars = settings.rag_max_doc_chars
+        self.max_context_chars = settings.rag_max_context_chars
+        # Full system prompt with cluster info: built by the first instance
+        # and shared by every later one through the class attribute
+        if RAGEngine.SYSTEM_PROMPT is None:
+            RAGEngine.SYSTEM_PROMPT = build_system_prompt()
     
     def _is_followup(self, question: str) -> bool:
         """Check if a question is a follow-up request."""
         q_lower = question.lower().strip()
-        # Check exact matches
-        if q_lower in self.FOLLOWUP_PHRASES:
+        # Check exact matches / starts with follow-up phrase (str.startswith
+        # takes the whole tuple and checks every prefix in C)
+        if q_lower in self.FOLLOWUP_SET or q_lower.startswith(self.FOLLOWUP_PHRASES):
             return True
-        # Check if starts with follow-up phrase
-        for phrase in self.FOLLOWUP_PHRASES:
-            if q_lower.startswith(phrase):
-                return True
         # Very short questions are likely follow-ups
         if len(q_lower.split()) <= 3 and "?" not in q_lower:
             return True
         return False
 
-    QUERY_PROMPT_TEMPLATE = """Use the following information to answer the student's question.
-
-RELEVANT COURSE INFORMATION (from catalog):
-{context}
-{schedule_context}
-STUDENT QUESTION:
-{question}
-
-Provide a helpful, accurate response. For specific course details (instructors, times, descriptions), use the RELEVANT COURSE INFORMATION.
-"""
+    # Substrings that mark a question as course-related (see is_course_related)
+    COURSE_KEYWORDS = (
+        "course", "class", "credit", "prerequisite", "prereq",
+        "schedule", "instructor", "professor", "section",
+        "enroll", "registration", "major", "minor", "degree",
+        "cs ", "math ", "stat ", "dsa ", "sts ",
+        "semester", "spring", "fall", "summer",
+    )
+    # All keywords as one case-insensitive alternation, scanned in a single pass
+    COURSE_KEYWORDS_RE = re.compile("|".join(map(re.escape, COURSE_KEYWORDS)), re.IGNORECASE)
+    # Course codes like "CS 3100" or "math3350" also warrant a catalog lookup
+    COURSE_CODE_RE = re.compile(r"\b[A-Za-z]{2,4}\s?\d{4}\b")
+    # Small talk that needs no catalog lookup: the whole message is a
+    # greeting, thanks, farewell or acknowledgement ("hi!", "thanks so much").
+    # Anything else is searched, since catalog questions often name no course
+    # ("who teaches machine learning?", "is algorithms hard?").
+    SMALL_TALK_RE = re.compile(
+        r"(?:(?:hi|hello|hey|howdy|yo|greetings|good (?:morning|afternoon|evening)"
+        r"|thanks|thank you|thx|ty|cheers|appreciate it"
+        r"|bye|goodbye|see you|see ya|later"
+        r"|ok|okay|cool|great|nice|awesome|perfect|got it|sounds good|lol|haha)"
+        r"(?: (?:there|so much|a lot|again|everyone|all|then|you))*[\s!.,:;)~-]*)+",
+        re.IGNORECASE,
+    )
+    
+    # Context placeholder when nothing was retrieved
+    NO_CONTEXT = "No specific course information found."
+    
+    # Questions about the student's own schedule ("when is my CS class?")
+    # search with the scheduled course codes appended
+    SCHEDULE_REFERENCE_RE = re.compile(r"\bmy (?:schedule|classes|courses|sections)\b", re.IGNORECASE)
+    
+    # Fixed parts of the per-query prompt; see _build_user_prompt. All static
+    # text comes first and the question last, so consecutive prompts (e.g.
+    # follow-ups reusing the same context) share the longest possible prefix.
+    QUERY_PROMPT_PREFIX = (
+        "Use the following information to answer the student's question. "
+        "Provide a helpful, accurate response. For specific course details "
+        "(instructors, times, descriptions), use the RELEVANT COURSE INFORMATION.\n"
+        "\n"
+        "RELEVANT COURSE INFORMATION (from catalog):\n"
+    )
+    QUERY_PROMPT_QUESTION = "\nSTUDENT QUESTION:\n"
+    
+    @classmethod
+    def _build_user_prompt(cls, context: str, schedule_context: str, question: str) -> str:
+        """Assemble the per-query prompt: static header, context, schedule, question."""
+        return "".join((
+            cls.QUERY_PROMPT_PREFIX,
+            context,
+            "\n",
+            schedule_context,
+            cls.QUERY_PROMPT_QUESTION,
+            question,
+        ))
     
     def _format_schedule_context(self, user_id: str = "default") -> str:
-        """Format user's schedule as context for the prompt."""
+        """Format user's schedule as context for the prompt.
+        
+        The result is cached per user and only rebuilt when the schedule
+        router reports a new schedule version.
+        """
+        version = get_schedule_version(user_id)
+        cached = self._schedule_cache.get(user_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
         schedule = get_user_schedule(user_id)
         if not schedule:
+            self._schedule_cache[user_id] = (version, "")
             return ""
         
         lines = ["\nSTUDENT'S CURRENT SCHEDULE:"]
-        for item in schedule:
+        # Sorted so the same schedule always renders to the same prompt text
+        for item in sorted(schedule, key=lambda i: (i["course_id"], i.get("section_id", ""))):
             course_line = f"- {item['course_id']}: {item['title']}"
             if item.get('days') and item.get('start_time'):
                 course_line += f" ({item['days']} {item['start_time']}-{item['end_time']})"
@@ -149,73 +256,292 @@ Provide a helpful, accurate response. For specific course details (instructors,
                 course_line += f" with {item['instructor']}"
             lines.append(course_line)
         
-        return "\n".join(lines) + "\n"
+        schedule_context = "\n".join(lines) + "\n"
+        self._schedule_cache[user_id] = (version, schedule_context)
+        return schedule_context
     
-    def query(
+    def _retrieval_query(self, question: str, user_id: str) -> str:
+        """Get the text to search with for a question.
+        
+        When the question refers to the student's own schedule, the scheduled
+        course codes are appended so the one search also finds those courses
+        (instead of embedding or searching for each course separately).
+        """
+        if not self.SCHEDULE_REFERENCE_RE.search(question):
+            return question
+        schedule = get_user_schedule(user_id)
+        if not schedule:
+            return question
+        course_ids = dict.fromkeys(item["course_id"] for item in schedule)
+        return f"{question} {' '.join(course_ids)}"
+    
+    def _build_context(self, question: str, n_results: int) -> tuple[str, tuple[str, ...], int]:
+        """Retrieve documents for a question and format them as prompt context.
+        
+        Results are cached briefly by (question, n_results), ignoring case and
+        whitespace, so retries and repeated questions skip the embedding call
+        and vector search. Safe to call from multiple request threads.
+        
+        Args:
+            question: User's question (after alias expansion)
+            n_results: Number of documents to retrieve
+            
+        Returns:
+            Tuple of (context string, source labels, number of documents used)
+        """
+        cache_key = (" ".join(question.lower().split()), n_results)
+        with self._context_lock:
+            cached = self._context_cache.get(cache_key)
+            if cached is not None:
+                self._context_hits += 1
+                return cached
+            self._context_misses += 1
+        
+        # Search outside the lock so concurrent requests aren't serialized
+        search_results = self._batcher.search(question, n_results)
+        result = self._format_context(search_results)
+        with self._context_lock:
+            self._context_cache[cache_key] = result
+        return result
+    
+    def get_cache_stats(self) -> dict:
+        """Get hit/miss counts for the retrieval context cache."""
+        with self._context_lock:
+            total = self._context_hits + self._context_misses
+            return {
+                "size": len(self._context_cache),
+                "hits": self._context_hits,
+                "misses": self._context_misses,
+                "hit_rate": self._context_hits / total if total else 0.0,
+            }
+    
+    def _format_context(self, search_results: dict) -> tuple[str, tuple[str, ...], int]:
+        """Format retrieved documents and their metadata within the context budget.
+        
+        Documents are taken in rank order. Each is truncated to
+        max_doc_chars, near-duplicates (same opening text) are skipped, and
+        lower-ranked documents that no longer fit in max_context_chars are
+        dropped. The top-ranked document is always kept.
+        
+        Args:
+            search_results: Result dict from VectorStore.search
+            
+        Returns:
+            Tuple of (context string, source labels, number of documents used)
+        """
+        docs = search_results["documents"]
+        metadatas = search_results.get("metadatas") or [None] * len(docs)
+        
+        context_parts = []
+        sources = []
+        seen = set()
+        budget = self.max_context_chars
+        dropped = 0
+        for i, (doc, meta) in enumerate(zip(docs, metadatas), 1):
+            if not doc:
+                continue
+            snippet = doc[:self.max_doc_chars]
+            fingerprint = snippet[:200]
+            if fingerprint in seen:
+                dropped += 1
+                continue
+            if context_parts and len(snippet) > budget:
+                dropped += 1
+                continue
+            seen.add(fingerprint)
+            budget -= len(snippet)
+            context_parts.append(f"[Source {i}]\n{snippet}")
+            # Source labels come from the metadata of each included document
+            if meta:
+                sources.append(
+                    f"{meta.get('subject', '')} {meta.get('catalog_number', '')} - {meta.get('title', '')}"
+                )
+        
+        if dropped:
+            logger.debug("[RAG] Context budget: dropped %d of %d documents", dropped, len(docs))
+        
+        context = "\n\n".join(context_parts) if context_parts else self.NO_CONTEXT
+        # Several chunks can come from one course; list each source once, in rank order
+        return context, tuple(dict.fromkeys(sources)), len(context_parts)
+    
+    def _prepare_prompt(
         self,
         question: str,
-        session_id: Optional[str] = None,
-        n_results: int = 15,  # Increased from 5 to 10 for better recall
+        n_results: int,
         user_id: str = "default",
-    ) -> dict:
-        """Process a user query with RAG.
+        session_id: Optional[str] = None,
+    ) -> tuple[str, list[str], int, str]:
+        """Build the full user prompt for a question (shared by query and query_stream).
+        
+        Expands course aliases, reuses the session's previous context for
+        follow-ups, otherwise retrieves context (skipped for small
+        talk), and adds the user's schedule.
         
         Args:
             question: User's question
-            session_id: Optional session ID for conversation memory
             n_results: Number of documents to retrieve
             user_id: User ID for schedule context
+            session_id: Optional session ID for follow-up context
             
         Returns:
-            Dictionary with response and sources
+            Tuple of (user prompt, source labels, number of documents used,
+            retrieved context)
         """
-
-        # Expand course aliases in question# Expand course aliases in question
+        # Expand course aliases in question
         question = expand_course_aliases(question)
 
         sources = []
-        context_parts = []
         
         # Check if this is a follow-up - reuse previous context if so
-        is_followup = session_id and self._is_followup(question) and session_id in _last_context
+        previous_context = None
+        original_q = ""
+        if session_id:
+            with _session_lock:
+                previous_context = _last_context.get(session_id)
+                original_q = _last_query.get(session_id, "")
+        is_followup = previous_context is not None and self._is_followup(question)
         
         if is_followup:
             # Reuse previous context for follow-up questions
-            context = _last_context[session_id]
+            context = previous_context
             # Enhance the question to make it clearer
-            original_q = _last_query.get(session_id, "")
             question = f"(Follow-up to previous question about '{original_q}'): {question}"
-            context_parts = ["(using cached context from previous query)"]
+            context_used = 1
+        elif not self._needs_retrieval(question):
+            # Small talk - skip the embedding call and vector search,
+            # but keep chat memory and schedule context
+            context = self.NO_CONTEXT
+            context_used = 0
         else:
             # New question - do fresh RAG retrieval
-            search_results = self.vector_store.search(query=question, n_results=n_results)
-            
-            # Format context from retrieved documents
-            for i, doc in enumerate(search_results["documents"]):
-                if doc:
-                    context_parts.append(f"[Source {i+1}]\n{doc}")
-                    
-                    # Extract source info from metadata
-                    metadata = search_results["metadatas"][i] if search_results["metadatas"] else {}
-                    if metadata:
-                        source_str = f"{metadata.get('subject', '')} {metadata.get('catalog_number', '')} - {metadata.get('title', '')}"
-                        sources.append(source_str)
-            
-            context = "\n\n".join(context_parts) if context_parts else "No specific course information found."
+            context, cached_sources, context_used = self._build_context(
+                self._retrieval_query(question, user_id), n_results
+            )
+            sources = list(cached_sources)
             
             # Store context for potential follow-ups
             if session_id:
-                _last_context[session_id] = context
-                _last_query[session_id] = question
+                with _session_lock:
+                    _last_context[session_id] = context
+                    _last_query[session_id] = question
         
         # Get schedule context
         schedule_context = self._format_schedule_context(user_id)
         
         # Build the prompt with context
-        user_prompt = self.QUERY_PROMPT_TEMPLATE.format(
-            context=context,
-            schedule_context=schedule_context,
-            question=question,
+        user_prompt = self._build_user_prompt(context, schedule_context, question)
+        return user_prompt, sources, context_used, context
+    
+    def _semantic_cache_key(
+        self,
+        question: str,
+        n_results: int,
+        user_id: str,
+        session_id: Optional[str],
+    ) -> Optional[tuple[list[float], tuple]]:
+        """Get the (embedding, tag) a query is cached under, or None if it isn't cacheable.
+        
+        Only catalog questions from users without a schedule are cached, and
+        in a session only the first message: later answers depend on the
+        conversation, and schedule context makes the prompt user-specific.
+        The embedding is the same one the vector search uses, so computing it
+        here costs no extra API call.
+        """
+        if get_user_schedule(user_id):
+            return None
+        if session_id and not self._is_new_session(session_id):
+            return None
+        question = expand_course_aliases(question)
+        if not self._needs_retrieval(question):
+            return None
+        embedding = self.vector_store.embed_queries([question])[0]
+        # Questions about different courses can embed almost identically
+        course_codes = frozenset(
+            code.replace(" ", "").upper() for code in self.COURSE_CODE_RE.findall(question)
+        )
+        return embedding, (n_results, course_codes)
+    
+    def _is_new_session(self, session_id: str) -> bool:
+        """Whether a session has no conversation yet (no context or chat turns)."""
+        with _session_lock:
+            if session_id in _last_context:
+                return False
+        return not self.gemini_service.has_chat_history(session_id)
+    
+    def _semantic_cache_lookup(
+        self,
+        question: str,
+        n_results: int,
+        user_id: str,
+        session_id: Optional[str],
+        chat_memory: bool = False,
+    ) -> tuple[Optional[tuple[list[float], tuple]], Optional[dict]]:
+        """Look up a query in the semantic cache.
+        
+        A hit in a session becomes the session's first turn: its context is
+        kept for follow-ups and, with chat_memory, the exchange is added to
+        the Gemini chat history so later messages can refer back to it.
+        
+        Args:
+            question: User's question
+            n_results: Number of documents to retrieve
+            user_id: User ID for schedule context
+            session_id: Optional session ID for conversation memory
+            chat_memory: Whether the session's answers come from a Gemini chat
+            
+        Returns:
+            Tuple of (cache key, or None if the query isn't cacheable; cached
+            result, or None on a miss)
+        """
+        cache_key = self._semantic_cache_key(question, n_results, user_id, session_id)
+        if cache_key is None:
+            return None, None
+        cached = self._semantic_cache.get(*cache_key)
+        if cached is None:
+            return cache_key, None
+        
+        result, context = cached
+        if session_id:
+            question = expand_course_aliases(question)
+            with _session_lock:
+                _last_context[session_id] = context
+                _last_query[session_id] = question
+            if chat_memory:
+                # Cached queries never have schedule context (see above)
+                self.gemini_service.add_chat_turn(
+                    session_id,
+                    self._build_user_prompt(context, "", question),
+                    result["response"],
+                    system_prompt=self.SYSTEM_PROMPT,
+                )
+        return cache_key, dict(result)
+    
+    def query(
+        self,
+        question: str,
+        session_id: Optional[str] = None,
+        n_results: int = 15,  # Increased from 5 to 10 for better recall
+        user_id: str = "default",
+    ) -> dict:
+        """Process a user query with RAG.
+        
+        Args:
+            question: User's question
+            session_id: Optional session ID for conversation memory
+            n_results: Number of documents to retrieve
+            user_id: User ID for schedule context
+            
+        Returns:
+            Dictionary with response and sources
+        """
+        cache_key, cached = self._semantic_cache_lookup(
+            question, n_results, user_id, session_id, chat_memory=True
+        )
+        if cached is not None:
+            return cached
+        
+        user_prompt, sources, context_used, context = self._prepare_prompt(
+            question, n_results, user_id=user_id, session_id=session_id
         )
         
         # Get response from Gemini (with or without memory)
@@ -237,11 +563,68 @@ Provide a helpful, accurate response. For specific course details (instructors,
                 max_tokens=1000,
             )
         
-        return {
+        result = {
             "response": response,
             "sources": sources,
-            "context_used": len(context_parts),
+            "context_used": context_used,
         }
+        if cache_key is not None:
+            self._semantic_cache.put(cache_key[0], (result, context), tag=cache_key[1])
+        return dict(result)
+    
+    async def aquery(
+        self,
+        question: str,
+        session_id: Optional[str] = None,
+        n_results: int = 15,
+        user_id: str = "default",
+    ) -> dict:
+        """Async variant of query for use on the event loop.
+        
+        Args:
+            question: User's question
+            session_id: Optional session ID for conversation memory
+            n_results: Number of documents to retrieve
+            user_id: User ID for schedule context
+            
+        Returns:
+            Dictionary with response and sources
+        """
+        # Retrieval is blocking (embedding call + Chroma), so run it in a thread
+        cache_key, cached = await asyncio.to_thread(
+            self._semantic_cache_lookup, question, n_results, user_id, session_id, True
+        )
+        if cached is not None:
+            return cached
+        
+        user_prompt, sources, context_used, context = await asyncio.to_thread(
+            self._prepare_prompt, question, n_results, user_id, session_id
+        )
+        
+        if session_id:
+            response = await self.gemini_service.aget_chat_completion(
+                prompt=user_prompt,
+                session_id=session_id,
+                system_prompt=self.SYSTEM_PROMPT,
+                temperature=0.7,
+                max_tokens=1000,
+            )
+        else:
+            response = await self.gemini_service.aget_completion(
+                prompt=user_prompt,
+                system_prompt=self.SYSTEM_PROMPT,
+                temperature=0.7,
+                max_tokens=1000,
+            )
+        
+        result = {
+            "response": response,
+            "sources": sources,
+            "context_used": context_used,
+        }
+        if cache_key is not None:
+            self._semantic_cache.put(cache_key[0], (result, context), tag=cache_key[1])
+        return dict(result)
     
     def clear_session(self, session_id: str) -> bool:
         """Clear a conversation session's memory.
@@ -252,11 +635,10 @@ Provide a helpful, accurate response. For specific course details (instructors,
         Returns:
             True if cleared, False if didn't exist
         """
-        # Clear context cache
-        if session_id in _last_context:
-            del _last_context[session_id]
-        if session_id in _last_query:
-            del _last_query[session_id]
+        # Clear context cache (entries may already have expired)
+        with _session_lock:
+            _last_context.pop(session_id, None)
+            _last_query.pop(session_id, None)
         return self.gemini_service.clear_chat_session(session_id)
     
     def query_stream(
@@ -264,6 +646,7 @@ Provide a helpful, accurate response. For specific course details (instructors,
         question: str,
         n_results: int = 10,
         user_id: str = "default",
+        session_id: Optional[str] = None,
     ):
         """Process a user query with RAG and stream the response.
         
@@ -271,40 +654,75 @@ Provide a helpful, accurate response. For specific course details (instructors,
             question: User's question
             n_results: Number of documents to retrieve
             user_id: User ID for schedule context
+            session_id: Optional session ID for follow-up context
             
         Yields:
             Text chunks as they are generated
         """
-        # Retrieve relevant documents
-        search_results = self.vector_store.search(query=question, n_results=n_results)
-        
-        # Format context from retrieved documents
-        context_parts = []
+        user_prompt, _, _, _ = self._prepare_prompt(
+            question, n_results, user_id=user_id, session_id=session_id
+        )
         
-        for i, doc in enumerate(search_results["documents"]):
-            if doc:
-                context_parts.append(f"[Source {i+1}]\n{doc}")
+        # Stream response from Gemini
+        for chunk in self.gemini_service.get_completion_stream(
+            prompt=user_prompt,
+            system_prompt=self.SYSTEM_PROMPT,
+            temperature=0.7,
+            max_tokens=1000,
+        ):
+            yield chunk
+    
+    async def aquery_stream(
+        self,
+        question: str,
+        n_results: int = 10,
+        user_id: str = "default",
+        session_id: Optional[str] = None,
+    ):
+        """Async variant of query_stream for use on the event loop.
         
-        context = "\n\n".join(context_parts) if context_parts else "No specific course information found."
+        Retrieval runs in a worker thread and the response is streamed with
+        Gemini's async client, so the event loop keeps serving other requests
+        (and flushing already-yielded bytes) while this one waits. Answers
+        found in the semantic cache are yielded as a single chunk.
         
-        # Get schedule context
-        schedule_context = self._format_schedule_context(user_id)
+        Args:
+            question: User's question
+            n_results: Number of documents to retrieve
+            user_id: User ID for schedule context
+            session_id: Optional session ID for follow-up context
+            
+        Yields:
+            Text chunks as they are generated
+        """
+        cache_key, cached = await asyncio.to_thread(
+            self._semantic_cache_lookup, question, n_results, user_id, session_id
+        )
+        if cached is not None:
+            yield cached["response"]
+            return
         
-        # Build the prompt
-        user_prompt = self.QUERY_PROMPT_TEMPLATE.format(
-            context=context,
-            schedule_context=schedule_context,
-            question=question,
+        user_prompt, sources, context_used, context = await asyncio.to_thread(
+            self._prepare_prompt, question, n_results, user_id, session_id
         )
         
-        # Stream response from Gemini
-        for chunk in self.gemini_service.get_completion_stream(
+        chunks = []
+        async for chunk in self.gemini_service.aget_completion_stream(
             prompt=user_prompt,
             system_prompt=self.SYSTEM_PROMPT,
             temperature=0.7,
             max_tokens=1000,
         ):
+            chunks.append(chunk)
             yield chunk
+        
+        if cache_key is not None:
+            result = {
+                "response": "".join(chunks),
+                "sources": sources,
+                "context_used": context_used,
+            }
+            self._semantic_cache.put(cache_key[0], (result, context), tag=cache_key[1])
     
     def simple_query(self, question: str) -> str:
         """Simple query without RAG (for general questions).
@@ -331,16 +749,19 @@ Provide a helpful, accurate response. For specific course details (instructors,
         Returns:
             True if question is about courses
         """
-        course_keywords = [
-            "course", "class", "credit", "prerequisite", "prereq",
-            "schedule", "instructor", "professor", "section",
-            "enroll", "registration", "major", "minor", "degree",
-            "cs ", "math ", "stat ", "dsa ", "sts ",
-            "semester", "spring", "fall", "summer",
-        ]
-        
-        question_lower = question.lower()
-        return any(keyword in question_lower for keyword in course_keywords)
+        return self.COURSE_KEYWORDS_RE.search(question) is not None
+    
+    @classmethod
+    def _needs_retrieval(cls, question: str) -> bool:
+        """Whether a question should go through the vector search (all but small talk)."""
+        return cls.SMALL_TALK_RE.fullmatch(question.strip()) is None
+
+
+@lru_cache(maxsize=1)
+def build_system_prompt() -> str:
+    """Get the full system prompt with the cluster summary filled in."""
+    return RAGEngine.SYSTEM_PROMPT_BASE.format(cluster_info=get_cluster_summary())
+
 
 COURSE_ALIASES: dict[str, str] = {
     "CSO1": "CS 2130",
@@ -352,6 +773,21 @@ COURSE_ALIASES: dict[str, str] = {
     "SDE": "CS 3140",
 }
 
+# First letters of all aliases; most positions in a question fail this
+# one-character check, so the alternation below is rarely even tried
+_ALIAS_FIRST_CHARS = "".join(sorted({re.escape(alias[0]) for alias in COURSE_ALIASES}))
+
+# All aliases in one case-insensitive pattern, so text is scanned once
+_ALIAS_RE = re.compile(
+    f"(?=[{_ALIAS_FIRST_CHARS}])(?:{'|'.join(map(re.escape, COURSE_ALIASES))})",
+    re.IGNORECASE,
+)
+
+
+def _expand_alias(match: re.Match) -> str:
+    alias = match.group(0).upper()
+    return f"{COURSE_ALIASES[alias]} ({alias})"
+
 
 def expand_course_aliases(text: str) -> str:
     """Expand course aliases in text to their full course codes.
@@ -362,10 +798,5 @@ def expand_course_aliases(text: str) -> str:
     Returns:
         Text with aliases expanded, e.g., "CSO1" -> "CS 2130 (CSO1)"
     """
-    result = text
-    for alias, course_code in COURSE_ALIASES.items():
-        # Case-insensitive replacement, preserving the alias in parentheses
-        pattern = re.compile(re.escape(alias), re.IGNORECASE)
-        if pattern.search(result):
-            result = pattern.sub(f"{course_code} ({alias})", result)
-    return result
\ No newline at end of file
+    # Case-insensitive replacement, preserving the alias in parentheses
+    return _ALIAS_RE.sub(_expand_alias, text)
@@ -0,0 +1,81 @@
+"""Semantic response cache keyed by query embedding."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import numpy as np
+
+
+class SemanticCache:
+    """Small in-memory LRU cache of responses, looked up by embedding similarity.
+    
+    Differently worded versions of the same question ("who teaches CS 2100?"
+    vs "instructor for DSA1") map to nearly identical embeddings, so a lookup
+    returns the stored response of the most similar earlier query if its
+    cosine similarity is at least `threshold`. Each entry also carries a
+    `tag` that must match exactly (e.g. the course codes in the question), so
+    near-identical questions about different courses never share answers.
+    """
+    
+    def __init__(self, maxsize: int = 500, threshold: float = 0.97):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._entries: OrderedDict[int, tuple[np.ndarray, Hashable, Any]] = OrderedDict()
+        self._next_id = 0
+        # Stacked unit vectors of all entries (rebuilt lazily after changes)
+        self._ids: list[int] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def get(self, embedding, tag: Hashable = None) -> Optional[Any]:
+        """Get the response stored for the most similar earlier query.
+        
+        Args:
+            embedding: Query embedding
+            tag: Value that must equal the stored entry's tag
+            
+        Returns:
+            Cached response, or None if no entry is similar enough
+        """
+        query = self._normalize(embedding)
+        with self._lock:
+            if not self._entries:
+                return None
+            if self._matrix is None:
+                self._ids = list(self._entries)
+                self._matrix = np.vstack([self._entries[i][0] for i in self._ids])
+            
+            # One matrix-vector product scores every entry
+            similarities = self._matrix @ query
+            for idx in np.argsort(similarities)[::-1]:
+                if similarities[idx] < self.threshold:
+                    break
+                entry_id = self._ids[idx]
+                _, entry_tag, response = self._entries[entry_id]
+                if entry_tag == tag:
+                    self._entries.move_to_end(entry_id)
+                    return response
+        return None
+    
+    def put(self, embedding, response: Any, tag: Hashable = None) -> None:
+        """Store a response under a query embedding (evicting the least recently used)."""
+        vector = self._normalize(embedding)
+        with self._lock:
+            self._entries[self._next_id] = (vector, tag, response)
+            self._next_id += 1
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            self._matrix = None
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
@@ -0,0 +1,90 @@
+"""Shared Jinja2 templates for the app and all routers.
+
+Every router renders through the same environment, so each template is
+compiled once per process and custom filters are registered in one place.
+"""
+
+from functools import lru_cache
+
+import mistune
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from app.config import get_settings
+
+
+# Templates compiled at startup so the first request doesn't pay for it
+PREWARM_TEMPLATES = (
+    "base.html",
+    "index.html",
+    "chat.html",
+    "courses.html",
+    "schedule.html",
+)
+
+# Markdown renderer - mistune is fast and handles edge cases well
+md = mistune.create_markdown(escape=False, plugins=['table', 'strikethrough'])
+
+
+def render_markdown(text: str) -> str:
+    """Convert markdown to HTML."""
+    return md(text)
+
+
+@lru_cache(maxsize=4096)
+def format_sis_time(time_str: str) -> str:
+    """Format SIS time string to readable format.
+    
+    Converts "09.00.00.000000" to "9:00 AM", "14.30.00.000000" to "2:30 PM".
+    Memoized, since course pages repeat the same few distinct times.
+    
+    Args:
+        time_str: Time string in format "HH.MM.SS.ffffff"
+    
+    Returns:
+        Formatted time string like "9:00 AM" or "2:30 PM"
+    """
+    if not time_str:
+        return ""
+    
+    try:
+        parts = time_str.split(".")
+        hour = int(parts[0])
+        minute = int(parts[1]) if len(parts) > 1 else 0
+        
+        period = "AM" if hour < 12 else "PM"
+        if hour == 0:
+            hour = 12
+        elif hour > 12:
+            hour -= 12
+        
+        return f"{hour}:{minute:02d} {period}"
+    except (ValueError, IndexError):
+        return time_str
+
+
+@lru_cache
+def get_templates() -> Jinja2Templates:
+    """Get the shared templates instance (built once per process).
+    
+    Template files are only re-checked for changes in debug mode, and compiled
+    bytecode is cached on disk so restarts skip re-parsing.
+    """
+    settings = get_settings()
+    env = Environment(
+        loader=FileSystemLoader(str(settings.templates_dir)),
+        autoescape=True,
+        auto_reload=settings.debug,
+        cache_size=400,
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+    env.filters["format_time"] = format_sis_time
+    env.filters["markdown"] = render_markdown
+    return Jinja2Templates(env=env)
+
+
+def prewarm_templates() -> None:
+    """Compile the main page templates ahead of the first request."""
+    env = get_templates().env
+    for name in PREWARM_TEMPLATES:
+        env.get_template(name)
@@ -32,32 +32,20 @@ def main():
     # total professors (uses the already-working professor list)
     total_profs = len(rmp.api.professors)
 
+    # Read the progress file once; after that each batch reports its own count
+    before_processed = rmp.get_processed_count(MAX_PAGES)
+
     try:
         while True:
-            # read processed count before
-            progress_path = rmp._cache_path("progress", MAX_PAGES)
-            before_processed = 0
-            try:
-                with open(progress_path, "r", encoding="utf-8") as f:
-                    before_processed = len(__import__("json").load(f).get("processed_tids", []))
-            except FileNotFoundError:
-                before_processed = 0
-
             # Do one incremental batch
             course_map = rmp.build_course_professor_map(
                 max_pages=MAX_PAGES,
                 batch_size=BATCH_SIZE,
             )
 
-            # Read processed count after
-            after_processed = 0
-            try:
-                with open(progress_path, "r", encoding="utf-8") as f:
-                    after_processed = len(__import__("json").load(f).get("processed_tids", []))
-            except FileNotFoundError:
-                after_processed = 0
-
+            after_processed = rmp.processed_count
             newly_processed = after_processed - before_processed
+            before_processed = after_processed
 
             print(
                 f"Courses so far: {len(course_map)} | "
@@ -5,7 +5,7 @@ Run from project root: python src/scripts/build_tcf_reviews_cache.py
 
 import json
 import time
-from app.data.sources.tcf_review_scraper import scrape_all_course_reviews
+from app.data.sources.tcf_review_scraper import scrape_all_course_reviews, extract_course_id
 from app.data.stores.tcf_instructor_reviews_store import TCFInstructorReviewsStore
 
 def parse_course_id_from_url(profile_url: str) -> int:
@@ -17,11 +17,7 @@ def parse_course_id_from_url(profile_url: str) -> int:
     Returns:
         course_id (e.g., 594)
     """
-    import re
-    match = re.search(r'/course/(\d+)/\d+/', profile_url)
-    if match:
-        return int(match.group(1))
-    return None
+    return extract_course_id(profile_url)
 
 
 def load_existing_course_cache(cache_path: str = "data/cache/tcf_reviews.json"):
@@ -8,6 +8,56 @@ from chromadb.config import Settings as ChromaSettings
 from pathlib import Path
 import numpy as np
 
+def top_similar_pairs(unit: np.ndarray, k: int = 10, block_size: int = 1024) -> list[tuple[float, int, int]]:
+    """Find the k most similar unordered pairs of unit-normalized rows.
+    
+    A pair in the global top k is always among each member's k+1 nearest
+    neighbours (counting itself), so a k+1 nearest-neighbour search per row
+    is enough. Uses faiss when installed; otherwise scores row blocks with
+    numpy so only block_size x n similarities are held at once.
+    
+    Args:
+        unit: (n, d) float32 array of unit-length embeddings
+        k: Number of pairs to return
+        block_size: Rows scored per matmul in the numpy fallback
+    
+    Returns:
+        List of (similarity, i, j) with i < j, most similar first
+    """
+    n = len(unit)
+    k = min(k, n * (n - 1) // 2)
+    if not k:
+        return []
+    
+    candidates = {}
+    try:
+        import faiss
+        
+        index = faiss.IndexFlatIP(unit.shape[1])
+        index.add(np.ascontiguousarray(unit))
+        scores, neighbours = index.search(unit, min(k + 1, n))
+        for i in range(n):
+            for score, j in zip(scores[i], neighbours[i]):
+                if j >= 0 and j != i:
+                    candidates[(min(i, j), max(i, j))] = float(score)
+    except ImportError:
+        for start in range(0, n, block_size):
+            sims = unit[start:start + block_size] @ unit.T
+            rows = np.arange(len(sims))
+            # Keep each pair once: only columns j > i
+            sims[np.arange(n) <= (rows + start)[:, None]] = -np.inf
+            flat = sims.ravel()
+            m = min(k, flat.size)
+            for idx in np.argpartition(flat, -m)[-m:]:
+                if flat[idx] == -np.inf:
+                    continue
+                r, j = divmod(int(idx), n)
+                candidates[(start + r, j)] = float(flat[idx])
+    
+    best = sorted(candidates.items(), key=lambda item: item[1], reverse=True)[:k]
+    return [(score, i, j) for (i, j), score in best]
+
+
 def main():
     print("Loading embeddings from ChromaDB...")
     
@@ -19,17 +69,31 @@ def main():
     )
     collection = client.get_collection("courses")
     
-    # Get all documents with embeddings
-    results = collection.get(
-        include=["embeddings", "metadatas", "documents"]
-    )
-    
-    if not results["ids"]:
+    # Page through the collection (documents aren't needed), copying each
+    # page of embeddings straight into one preallocated float32 array so the
+    # full list-of-lists never exists at once
+    total = collection.count()
+    if not total:
         print("No documents found! Run indexing first.")
         return
     
-    embeddings = np.array(results["embeddings"])
-    metadatas = results["metadatas"]
+    page_size = 1000
+    embeddings = None
+    metadatas = []
+    for offset in range(0, total, page_size):
+        page = collection.get(
+            include=["embeddings", "metadatas"],
+            limit=page_size,
+            offset=offset,
+        )
+        rows = np.asarray(page["embeddings"], dtype=np.float32)
+        if embeddings is None:
+            embeddings = np.empty((total, rows.shape[1]), dtype=np.float32)
+        embeddings[offset:offset + len(rows)] = rows
+        metadatas.extend(page["metadatas"])
+    
+    # The collection could shrink between count() and the last page
+    embeddings = embeddings[:len(metadatas)]
     
     print(f"Loaded {len(embeddings)} embeddings with {embeddings.shape[1]} dimensions")
     
@@ -43,20 +107,41 @@ def main():
     
     try:
         from sklearn.decomposition import PCA
-        from sklearn.manifold import TSNE
         
-        # First reduce with PCA to 50 dims (faster for t-SNE)
+        # First reduce with PCA to 50 dims (faster for t-SNE); randomized SVD
+        # only computes the leading components
         if embeddings.shape[1] > 50:
-            print("  PCA: 3072 -> 50 dimensions...")
-            pca = PCA(n_components=50)
+            print(f"  PCA: {embeddings.shape[1]} -> 50 dimensions...")
+            pca = PCA(n_components=50, svd_solver="randomized", random_state=0)
             embeddings_pca = pca.fit_transform(embeddings)
         else:
             embeddings_pca = embeddings
         
-        # Then t-SNE to 2D
-        print("  t-SNE: 50 -> 2 dimensions...")
-        tsne = TSNE(n_components=2, random_state=42, perplexity=min(30, len(embeddings)-1))
-        embeddings_2d = tsne.fit_transform(embeddings_pca)
+        # Then t-SNE to 2D on all cores (openTSNE's FFT gradients if installed)
+        print(f"  t-SNE: {embeddings_pca.shape[1]} -> 2 dimensions...")
+        perplexity = min(30, len(embeddings) - 1)
+        try:
+            from openTSNE import TSNE as OpenTSNE
+            
+            tsne = OpenTSNE(
+                perplexity=perplexity,
+                n_jobs=-1,
+                negative_gradient_method="fft",
+                random_state=42,
+            )
+            embeddings_2d = np.asarray(tsne.fit(embeddings_pca))
+        except ImportError:
+            from sklearn.manifold import TSNE
+            
+            tsne = TSNE(
+                n_components=2,
+                random_state=42,
+                perplexity=perplexity,
+                init="pca",
+                learning_rate="auto",
+                n_jobs=-1,
+            )
+            embeddings_2d = tsne.fit_transform(embeddings_pca)
         
     except ImportError:
         print("sklearn not found. Install with: pip install scikit-learn")
@@ -111,45 +196,42 @@ def main():
     print("SIMILARITY ANALYSIS")
     print("="*50)
     
-    # Find most similar course pairs
-    from sklearn.metrics.pairwise import cosine_similarity
+    # Unit-normalize once so cosine similarity is a float32 dot product
+    unit = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(unit, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    unit = unit / norms
     
-    sim_matrix = cosine_similarity(embeddings)
-    np.fill_diagonal(sim_matrix, 0)  # Ignore self-similarity
+    # Per-subject average similarity to the other courses in the subject,
+    # from each subject's own block rather than the full n x n matrix
+    subject_avgs = {}
+    for subj in ["CS", "MATH", "STAT"]:
+        subj_indices = np.array([i for i, m in enumerate(metadatas) if m.get("subject") == subj])
+        
+        if len(subj_indices) < 2:
+            continue
+        
+        sub_unit = unit[subj_indices]
+        sub = sub_unit @ sub_unit.T
+        avgs = (sub.sum(axis=1) - np.diag(sub)) / (len(subj_indices) - 1)
+        lowest = np.argsort(avgs)[:3]
+        subject_avgs[subj] = [(subj_indices[k], avgs[k]) for k in lowest]
     
-    # Find top similar pairs
     print("\nTop 10 most similar course pairs:")
-    flat_indices = np.argsort(sim_matrix.ravel())[-10:][::-1]
-    for idx in flat_indices:
-        i, j = np.unravel_index(idx, sim_matrix.shape)
+    for score, i, j in top_similar_pairs(unit, 10):
         m1, m2 = metadatas[i], metadatas[j]
         c1 = f"{m1.get('subject', '')} {m1.get('catalog_number', '')} - {m1.get('title', '')}"
         c2 = f"{m2.get('subject', '')} {m2.get('catalog_number', '')} - {m2.get('title', '')}"
-        print(f"  {sim_matrix[i,j]:.3f}: {c1} <-> {c2}")
+        print(f"  {score:.3f}: {c1} <-> {c2}")
     
     # Find least similar pairs among same subject
     print("\nPotential outliers (low similarity within same subject):")
-    for subj in ["CS", "MATH", "STAT"]:
-        subj_mask = [m.get("subject") == subj for m in metadatas]
-        subj_indices = [i for i, m in enumerate(metadatas) if m.get("subject") == subj]
-        
-        if len(subj_indices) < 2:
-            continue
-            
-        # Get avg similarity for each course to others in same subject
-        avg_sims = []
-        for i in subj_indices:
-            sims = [sim_matrix[i, j] for j in subj_indices if i != j]
-            avg_sims.append((i, np.mean(sims) if sims else 0))
-        
-        avg_sims.sort(key=lambda x: x[1])
-        
+    for subj, avg_sims in subject_avgs.items():
         print(f"\n  {subj} courses with lowest avg similarity to other {subj} courses:")
-        for i, avg in avg_sims[:3]:
+        for i, avg in avg_sims:
             m = metadatas[i]
             print(f"    {avg:.3f}: {m.get('subject', '')} {m.get('catalog_number', '')} - {m.get('title', '')}")
 
-
 if __name__ == "__main__":
     main()
 
@@ -0,0 +1,37 @@
+"""Tests for the RAG engine's retrieval gate."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# The engine module imports the Gemini and Chroma clients
+pytest.importorskip("google.generativeai")
+pytest.importorskip("chromadb")
+
+from app.services.rag_engine import RAGEngine  # noqa: E402
+
+
+@pytest.mark.parametrize("question", [
+    "hi",
+    "Hello there!",
+    "thanks so much :)",
+    "ok, got it",
+    "Bye!",
+])
+def test_small_talk_skips_retrieval(question):
+    assert not RAGEngine._needs_retrieval(question)
+
+
+@pytest.mark.parametrize("question", [
+    "Who teaches machine learning?",
+    "What are good AI electives?",
+    "Is algorithms hard?",
+    "What's CS 3100 about?",
+    "hi, what courses cover databases?",
+    "thanks! what about operating systems?",
+])
+def test_catalog_questions_are_searched(question):
+    assert RAGEngine._needs_retrieval(question)